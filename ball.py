@@ -0,0 +1,213 @@
+import random
+from typing import Optional
+
+import pygame
+
+from colors import get_color
+from config import (
+    BALL_RADIUS,
+    HALO_RADIUS,
+    PERFECT_THROWING,
+    THROW_ARC_DIVISOR,
+    THROW_DEVIATION_FACTOR,
+    THROW_MAX_YARDS,
+    THROW_MIN_ARC,
+    THROW_MIN_FRAMES,
+    THROW_SPEED,
+    YARD_LENGTH,
+)
+from player import Player
+
+
+class BallFlight:
+    """Closed-form flight of a thrown ball
+
+    Frame k of the flight (1 <= k <= n_frames) matches stepping the ball k
+    times: the ground position moves linearly from `start` and the height
+    follows z(k) = k * z_velocity - z_gravity * k * (k - 1) / 2.
+    """
+
+    def __init__(
+        self,
+        start: pygame.Vector2,
+        velocity: pygame.Vector2,
+        arc_height: float,
+        n_frames: int,
+    ):
+        self.start = start
+        self.velocity = velocity
+        self.arc_height = arc_height
+        self.n_frames = n_frames
+
+        half_frames = n_frames / 2
+        self.z_velocity = 2 * arc_height / half_frames
+        self.z_gravity = (2 * arc_height) / (half_frames**2)
+
+    @property
+    def landing_at(self) -> pygame.Vector2:
+        return self.start + self.velocity * self.n_frames
+
+    def position_at(self, frame: int) -> pygame.Vector2:
+        frame = min(max(frame, 0), self.n_frames)
+        return self.start + self.velocity * frame
+
+    def z_at(self, frame: int) -> float:
+        if frame <= 0 or frame > self.n_frames:
+            return 0
+        return frame * self.z_velocity - self.z_gravity * frame * (frame - 1) / 2
+
+
+class Ball(pygame.sprite.Sprite):
+    def __init__(self, verbose=True, rng: Optional[random.Random] = None):
+        super().__init__()
+        self.verbose = verbose
+        self.rng = rng or random.Random()
+        self.pos = pygame.Vector2(0, 0)
+        self.z = 0
+        self.landing_at = pygame.Vector2(0, 0)
+        self.flight: Optional[BallFlight] = None
+        # Frames flown so far and frames remaining in the current flight
+        self.flight_frame = 0
+        self.frames_left = 0
+        self.image = pygame.Surface((BALL_RADIUS * 2, BALL_RADIUS * 2), pygame.SRCALPHA)
+        self.rect = self.image.get_rect(center=self.pos)
+
+        # Draw ball circle
+        pygame.draw.circle(
+            self.image,
+            get_color("yellow", 800),
+            (
+                BALL_RADIUS,
+                BALL_RADIUS,
+            ),
+            BALL_RADIUS,
+        )
+
+    def throw_to(self, target_pos: pygame.Vector2, player: Player, lob=False):
+        throw_power = player.record.throw_power
+        throw_accuracy = player.record.throw_accuracy
+
+        offset = target_pos - self.pos
+        distance = offset.length()
+
+        throw_speed = max(2, THROW_SPEED * (throw_power / 100))
+        throw_min_frames = THROW_MIN_FRAMES
+        throw_min_arc = THROW_MIN_ARC
+        throw_arc_divisor = THROW_ARC_DIVISOR
+
+        # Adjust parameters for lob throws
+        if lob:
+            throw_speed *= 0.7
+            throw_min_frames *= 1.5
+            throw_min_arc *= 1.5
+            throw_arc_divisor /= 1.5
+            throw_accuracy *= 0.9
+
+        # Adjust target position based on throw power
+        max_distance = THROW_MAX_YARDS * YARD_LENGTH * (throw_power / 100)
+        if distance > max_distance:
+            direction = offset.normalize()
+            target_pos = self.pos + direction * max_distance
+            offset = target_pos - self.pos
+            distance = max_distance
+
+        # Calculate random angle deviation based on throw_accuracy
+        max_deviation = (100 - throw_accuracy) * THROW_DEVIATION_FACTOR
+        angle_deviation = (
+            self.rng.uniform(-max_deviation, max_deviation)
+            if not PERFECT_THROWING
+            else 0
+        )
+
+        # Adjust target position based on deviation
+        if distance > 0:
+            direction = (target_pos - self.pos).normalize()
+            direction = direction.rotate(angle_deviation)
+            target_pos = self.pos + direction * distance
+            offset = target_pos - self.pos
+            distance = offset.length()
+
+        self.landing_at = target_pos.copy()
+
+        # Calculate number of frames for the throw
+        n_frames = max(throw_min_frames, int(distance / throw_speed))
+
+        # Calculate arc parameters
+        arc_height = max(throw_min_arc, distance / throw_arc_divisor)
+        self.flight = BallFlight(
+            self.pos.copy(), offset / n_frames, arc_height, n_frames
+        )
+        self.z = 0
+        self.flight_frame = 0
+        self.frames_left = n_frames
+
+        if self.verbose:
+            print(
+                f"Ball thrown [throw_power={throw_power} throw_accuracy={throw_accuracy:.1f} distance_yards={distance / YARD_LENGTH:.1f} throw_speed={throw_speed:.1f} angle_deviation={angle_deviation:.1f} max_height={arc_height / YARD_LENGTH:.1f} n_frames={n_frames}]"
+            )
+
+    def stop(self):
+        self.z = 0
+        self.landing_at = pygame.Vector2(0, 0)
+        self.flight = None
+        self.flight_frame = 0
+        self.frames_left = 0
+
+    def position_in(self, frames: int) -> pygame.Vector2:
+        """Where the ball will be after n more frames"""
+        if self.flight is None:
+            return self.pos.copy()
+        return self.flight.position_at(self.flight_frame + frames)
+
+    def z_in(self, frames: int) -> float:
+        """Ball height after n more frames"""
+        if self.flight is None:
+            return 0
+        return self.flight.z_at(self.flight_frame + frames)
+
+    def set_pos(self, pos: pygame.Vector2):
+        self.pos = pos
+        self.rect.center = self.pos
+
+    def reset_to(self, pos: pygame.Vector2):
+        self.stop()
+        self.set_pos(pos)
+
+    def fast_forward(self, frames: int):
+        """Advance the flight by up to n frames in one jump"""
+        if self.frames_left <= 0:
+            self.stop()
+            return
+
+        frames = min(frames, self.frames_left)
+        self.flight_frame += frames
+        self.frames_left -= frames
+        self.z = self.flight.z_at(self.flight_frame)
+        if self.z < 0:
+            self.stop()
+            return
+        self.set_pos(self.flight.position_at(self.flight_frame))
+
+    def update(self):
+        self.fast_forward(1)
+
+
+class Halo(pygame.sprite.Sprite):
+    def __init__(self):
+        super().__init__()
+        self.pos = pygame.Vector2(0, 0)
+        self.image = pygame.Surface((HALO_RADIUS * 2, HALO_RADIUS * 2), pygame.SRCALPHA)
+        self.rect = self.image.get_rect(center=self.pos)
+
+        # Draw halo circle
+        pygame.draw.circle(
+            self.image,
+            get_color("yellow", 300),
+            (HALO_RADIUS, HALO_RADIUS),
+            HALO_RADIUS,
+            1,
+        )
+
+    def set_pos(self, pos: pygame.Vector2):
+        self.pos = pos
+        self.rect.center = self.pos
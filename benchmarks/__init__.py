@@ -0,0 +1 @@
+"""Seeded, headless performance scenarios, run with `python -m benchmarks`"""
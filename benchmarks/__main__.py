@@ -0,0 +1,95 @@
+import argparse
+import json
+import sys
+from pathlib import Path
+
+import pygame
+
+from benchmarks.scenarios import SCENARIOS
+from team import load_teams
+
+BASELINE_PATH = Path(__file__).parent / "baseline.json"
+# Allowed slowdown relative to the baseline before a scenario counts as a
+# regression
+DEFAULT_TOLERANCE = 0.25
+
+
+def run(names: list[str], repeat: int) -> dict[str, dict]:
+    pygame.font.init()
+    teams = load_teams()
+
+    results = {}
+    for name in names:
+        # Keep the fastest run, it's the one least disturbed by the machine
+        runs = [SCENARIOS[name](teams) for _ in range(repeat)]
+        results[name] = min(runs, key=lambda r: r["ms_per_iteration"])
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Names of scenarios slower than their baseline by more than tolerance"""
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        limit = baseline[name]["ms_per_iteration"] * (1 + tolerance)
+        if result["ms_per_iteration"] > limit:
+            regressions.append(name)
+    return regressions
+
+
+def report(results: dict, baseline: dict):
+    for name, result in results.items():
+        line = (
+            f"{name:<20} {result['ms_per_iteration']:9.3f} ms"
+            f" {result['per_second']:10.1f}/s"
+        )
+        if name in baseline:
+            change = result["ms_per_iteration"] / baseline[name]["ms_per_iteration"]
+            line += f" {change - 1:+7.1%} vs baseline"
+        print(line)
+        for stage, ms in result["stages"].items():
+            print(f"    {stage:<18} {ms:8.3f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the engine benchmarks")
+    parser.add_argument(
+        "scenarios",
+        nargs="*",
+        help=f"scenarios to run (default all): {', '.join(SCENARIOS)}",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="store these results as the new baseline",
+    )
+    args = parser.parse_args()
+
+    names = args.scenarios or list(SCENARIOS)
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)}")
+
+    baseline = {}
+    if args.baseline.exists():
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+
+    results = run(names, args.repeat)
+    report(results, baseline)
+
+    if args.update_baseline:
+        baseline.update(results)
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=4)
+        print(f"Baseline written to {args.baseline}")
+        sys.exit(0)
+
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"Regressions beyond {args.tolerance:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
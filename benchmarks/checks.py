@@ -0,0 +1,280 @@
+import argparse
+import math
+import random
+import sys
+from typing import Callable
+
+import pygame
+
+from benchmarks.scenarios import SEED, make_pileup, make_stress
+from catching import CatchWindow
+from collisions import COLLISION_SOLVERS
+from config import COLLISION_DISTANCE, FRAME_RATE, HEIGHT, WIDTH
+from monte_carlo import PASS_RESULTS, ThrowToRandom
+from player import Player
+from renderer import Renderer
+from simulation import PLAYS, Simulation
+from team import Team, get_team, load_teams
+
+# Frames each seeded setup is run for before results are compared
+CHECK_FRAMES = 300
+# Seeded throws played out with and without predicted catch windows, and
+# event driven against frame stepping
+CATCH_THROWS = 200
+# Pixels event-driven players may end up from where frame stepping puts
+# them, the closed form rounds differently
+DRIFT_TOLERANCE = 0.01
+# Frames drawn both ways for each play, with a pass thrown along the way
+RENDER_FRAMES = 180
+
+
+class EveryFrame(CatchWindow):
+    """A catch window covering the whole flight that never goes stale"""
+
+    def __init__(self, receiver: Player):
+        super().__init__(receiver, [(0, math.inf)])
+
+    def is_stale(self) -> bool:
+        return False
+
+
+class ScanningSimulation(Simulation):
+    """Tests every receiver's catch rect on every flight frame, the per-frame
+    scan predicted catch windows replaced"""
+
+    def predict_catch_windows(self):
+        self.catch_windows = {
+            receiver: EveryFrame(receiver) for receiver in self.receivers
+        }
+
+
+def get_motion(players) -> list[tuple[float, float, float, float]]:
+    return [(*player.pos, *player.velocity) for player in players]
+
+
+def describe_events(sim: Simulation) -> list[tuple]:
+    """Events with players and vectors as plain values, comparable across runs"""
+
+    def describe(value):
+        if isinstance(value, Player):
+            return str(value)
+        if isinstance(value, pygame.Vector2):
+            return tuple(value)
+        return value
+
+    return [
+        (
+            event.frame,
+            event.name,
+            sorted((k, describe(v)) for k, v in event.data.items()),
+        )
+        for event in sim.events
+    ]
+
+
+def find_mismatch(name: str, expected: list, actual: list) -> list[str]:
+    """A message naming the first entry that differs, if any"""
+    for i, (a, b) in enumerate(zip(expected, actual)):
+        if a != b:
+            return [f"{name}: entry {i} differs, {a} != {b}"]
+    if len(expected) != len(actual):
+        return [f"{name}: {len(expected)} entries != {len(actual)}"]
+    return []
+
+
+def check_grid_solver(teams: list[Team]) -> list[str]:
+    """The grid solver moves every player exactly like the pairwise one"""
+    setups = {
+        "pileup": lambda rng: make_pileup(teams),
+        "stress": lambda rng: make_stress(teams, rng),
+    }
+    failures = []
+    for name, setup in setups.items():
+        results = {}
+        for solver in ("pairwise", "grid"):
+            rng = random.Random(SEED)
+            players = setup(rng)
+            handle_player_collisions = COLLISION_SOLVERS[solver]
+            for _ in range(CHECK_FRAMES):
+                players.update()
+                handle_player_collisions(players, COLLISION_DISTANCE, rng)
+            results[solver] = get_motion(players)
+        failures += find_mismatch(name, results["pairwise"], results["grid"])
+
+    # Simulations with bound players go through the array path
+    for play in range(len(PLAYS)):
+        results = {}
+        for solver in ("pairwise", "grid"):
+            sim = Simulation(
+                get_team(teams, "Warforge"),
+                play_selected=play,
+                verbose=False,
+                vectorized_movement=True,
+                collision_solver=solver,
+                seed=SEED,
+            )
+            sim.snap()
+            sim.step(CHECK_FRAMES)
+            results[solver] = get_motion(sim.all_players)
+        failures += find_mismatch(
+            f"play_{play} vectorized", results["pairwise"], results["grid"]
+        )
+    return failures
+
+
+def get_throw(seed: int) -> tuple[int, ThrowToRandom]:
+    """Play and policy of a seeded throw, varying when it's thrown and its arc"""
+    throw_rng = random.Random(seed)
+    play = seed % len(PLAYS)
+    policy = ThrowToRandom(
+        throw_after=throw_rng.randint(FRAME_RATE // 3, FRAME_RATE * 2),
+        lob=throw_rng.random() < 0.5,
+    )
+    return play, policy
+
+
+def play_throw(sim: Simulation, policy: ThrowToRandom):
+    sim.snap()
+    sim.step(policy.throw_after)
+    _, target = policy.target(sim)
+    sim.throw(target, lob=policy.lob)
+    sim.run_until(PASS_RESULTS, FRAME_RATE * 10)
+
+
+def check_catch_windows(teams: list[Team]) -> list[str]:
+    """Predicted catch windows give the same catches as scanning every frame"""
+    failures = []
+    for seed in range(CATCH_THROWS):
+        play, policy = get_throw(seed)
+        results = {}
+        for simulation_class in (ScanningSimulation, Simulation):
+            sim = simulation_class(
+                get_team(teams, "Warforge"),
+                play_selected=play,
+                verbose=False,
+                seed=seed,
+            )
+            play_throw(sim, policy)
+            results[simulation_class] = describe_events(sim) + get_motion(
+                sim.all_players
+            )
+        failures += find_mismatch(
+            f"throw {seed}", results[ScanningSimulation], results[Simulation]
+        )
+    return failures
+
+
+def check_event_driven(teams: list[Team]) -> list[str]:
+    """Skipping frames gives the same events and catchers as stepping them
+
+    Event frames, names, players and rolls have to match exactly, player
+    positions to within DRIFT_TOLERANCE.
+    """
+    failures = []
+    for seed in range(CATCH_THROWS):
+        play, policy = get_throw(seed)
+        events, positions = {}, {}
+        for event_driven in (False, True):
+            sim = Simulation(
+                get_team(teams, "Warforge"),
+                play_selected=play,
+                verbose=False,
+                seed=seed,
+                event_driven=event_driven,
+            )
+            play_throw(sim, policy)
+            events[event_driven] = [
+                (event.frame, event.name, str(event.data.get("player")))
+                + ((event.data["roll"],) if "roll" in event.data else ())
+                for event in sim.events
+            ]
+            positions[event_driven] = [player.pos for player in sim.all_players]
+
+        name = f"throw {seed}"
+        mismatch = find_mismatch(name, events[False], events[True])
+        if mismatch:
+            failures += mismatch
+            continue
+        drift = max((a - b).length() for a, b in zip(positions[False], positions[True]))
+        if drift > DRIFT_TOLERANCE:
+            failures.append(f"{name}: players drifted {drift:.3g} px")
+    return failures
+
+
+def check_dirty_rects(teams: list[Team]) -> list[str]:
+    """Dirty-rect frames are pixel for pixel the same as full redraws"""
+    failures = []
+    for play in range(len(PLAYS)):
+        for debug_overlays in (False, True):
+            sim = Simulation(
+                get_team(teams, "Warforge"),
+                play_selected=play,
+                verbose=False,
+                seed=SEED,
+            )
+            policy = ThrowToRandom()
+            renderers = [
+                Renderer(sim, dirty_rects=dirty_rects, debug_overlays=debug_overlays)
+                for dirty_rects in (False, True)
+            ]
+            screens = [pygame.Surface((WIDTH, HEIGHT)) for _ in renderers]
+
+            sim.snap()
+            for frame in range(RENDER_FRAMES):
+                if frame == policy.throw_after and sim.ball_carrier is not None:
+                    _, target = policy.target(sim)
+                    sim.throw(target, lob=policy.lob)
+                sim.update()
+                for renderer, screen in zip(renderers, screens):
+                    renderer.draw(screen)
+
+                full, dirty = (
+                    pygame.image.tobytes(screen, "RGB") for screen in screens
+                )
+                if full != dirty:
+                    failures.append(
+                        f"play_{play} debug_overlays={debug_overlays}: "
+                        f"frame {frame} differs from the full redraw"
+                    )
+                    break
+    return failures
+
+
+CHECKS: dict[str, Callable[[list[Team]], list[str]]] = {
+    "grid_solver": check_grid_solver,
+    "catch_windows": check_catch_windows,
+    "event_driven": check_event_driven,
+    "dirty_rects": check_dirty_rects,
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Check fast paths against the code they replace, with fixed seeds"
+    )
+    parser.add_argument(
+        "checks",
+        nargs="*",
+        help=f"checks to run (default all): {', '.join(CHECKS)}",
+    )
+    args = parser.parse_args()
+
+    names = args.checks or list(CHECKS)
+    unknown = [name for name in names if name not in CHECKS]
+    if unknown:
+        parser.error(f"unknown checks: {', '.join(unknown)}")
+
+    pygame.font.init()
+    teams = load_teams()
+
+    failed = []
+    for name in names:
+        failures = CHECKS[name](teams)
+        print(f"{name:<20} {'FAIL' if failures else 'ok'}")
+        for failure in failures:
+            print(f"    {failure}")
+        if failures:
+            failed.append(name)
+
+    if failed:
+        sys.exit(1)
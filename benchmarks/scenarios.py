@@ -0,0 +1,255 @@
+import random
+import time
+from typing import Callable
+
+import pygame
+
+from collisions import COLLISION_SOLVERS
+from config import (
+    COLLISION_DISTANCE,
+    FIELD_CENTER,
+    FIELD_HEIGHT,
+    FIELD_WIDTH,
+    HEIGHT,
+    PLAYER_RADIUS,
+    WIDTH,
+)
+from field import Field
+from player import Player
+from profiler import FrameProfiler
+from renderer import Renderer
+from simulation import PLAYS, Simulation
+from team import RosterStore, Team, get_team, load_teams
+from team_generator import generate_league
+from utils import get_yard_x
+
+SEED = 0
+PLAY_FRAMES = 300
+PILEUP_FRAMES = 300
+STRESS_FRAMES = 300
+STRESS_PLAYERS = 200
+FIELD_BUILDS = 20
+ROSTER_LOADS = 20
+LEAGUE_BUILDS = 5
+LEAGUE_TEAMS = 100
+
+# Positions filling an eleven-man side, as Simulation lines them up
+LINEUP = [
+    ("OT", 0),
+    ("OG", 0),
+    ("C", 0),
+    ("OG", 1),
+    ("OT", 1),
+    ("QB", 0),
+    ("HB", 0),
+    ("TE", 0),
+    ("WR", 0),
+    ("WR", 1),
+    ("WR", 2),
+]
+
+
+def make_lineup(team: Team) -> list[Player]:
+    return [Player.from_roster(team, position, index) for position, index in LINEUP]
+
+
+def make_result(iterations: int, seconds: float, profiler: FrameProfiler) -> dict:
+    return {
+        "iterations": iterations,
+        "ms_per_iteration": seconds * 1000 / iterations,
+        "per_second": iterations / seconds,
+        "stages": {
+            name: stats["p50"]
+            for name, stats in profiler.summary().items()
+            if name != "total"
+        },
+    }
+
+
+def bench_play(teams: list[Team], play: int) -> dict:
+    """Snap and run a play for PLAY_FRAMES frames, rendering off-screen"""
+    profiler = FrameProfiler(window=PLAY_FRAMES)
+    sim = Simulation(
+        get_team(teams, "Warforge"),
+        play_selected=play,
+        verbose=False,
+        seed=SEED,
+        profiler=profiler,
+    )
+    renderer = Renderer(sim, profiler)
+    screen = pygame.Surface((WIDTH, HEIGHT))
+
+    sim.snap()
+    start = time.perf_counter()
+    for _ in range(PLAY_FRAMES):
+        sim.update()
+        renderer.draw(screen)
+        profiler.end_frame()
+    seconds = time.perf_counter() - start
+
+    return make_result(PLAY_FRAMES, seconds, profiler)
+
+
+def make_pileup(teams: list[Team]) -> pygame.sprite.Group:
+    """Two lines of eleven driving into each other at the line of scrimmage"""
+    offense = make_lineup(get_team(teams, "Warforge"))
+    defense = make_lineup(next(t for t in teams if t.name != "Warforge"))
+    players = pygame.sprite.Group(offense, defense)
+
+    los_x = get_yard_x(50)
+    spacing = PLAYER_RADIUS * 1.5
+    for i, (o, d) in enumerate(zip(offense, defense)):
+        y = FIELD_CENTER.y + (i - len(offense) / 2) * spacing
+        o.reset_to(pygame.Vector2(los_x - PLAYER_RADIUS, y))
+        d.reset_to(pygame.Vector2(los_x + PLAYER_RADIUS, y))
+        o.direction = pygame.Vector2(1, 0)
+        d.direction = pygame.Vector2(-1, 0)
+    return players
+
+
+def bench_pileup(teams: list[Team], solver: str) -> dict:
+    """make_pileup pushed apart by one of the collision solvers"""
+    handle_player_collisions = COLLISION_SOLVERS[solver]
+    rng = random.Random(SEED)
+    players = make_pileup(teams)
+
+    profiler = FrameProfiler(window=PILEUP_FRAMES)
+    start = time.perf_counter()
+    for _ in range(PILEUP_FRAMES):
+        with profiler.section("players"):
+            players.update()
+        with profiler.section("collisions"):
+            handle_player_collisions(players, COLLISION_DISTANCE, rng)
+        profiler.end_frame()
+    seconds = time.perf_counter() - start
+
+    return make_result(PILEUP_FRAMES, seconds, profiler)
+
+
+def make_stress(teams: list[Team], rng: random.Random) -> pygame.sprite.Group:
+    """STRESS_PLAYERS players running random routes across the whole field"""
+    players = pygame.sprite.Group()
+    while len(players) < STRESS_PLAYERS:
+        for team in teams:
+            for player in make_lineup(team):
+                if len(players) < STRESS_PLAYERS:
+                    players.add(player)
+
+    for player in players:
+        player.reset_to(
+            pygame.Vector2(rng.uniform(0, FIELD_WIDTH), rng.uniform(0, FIELD_HEIGHT))
+        )
+        player.set_route(
+            [
+                {"yards": rng.uniform(2, 15), "angle": rng.uniform(-180, 180)}
+                for _ in range(3)
+            ]
+        )
+        player.start_route()
+    return players
+
+
+def bench_stress(teams: list[Team]) -> dict:
+    """make_stress with the grid solver"""
+    rng = random.Random(SEED)
+    players = make_stress(teams, rng)
+
+    profiler = FrameProfiler(window=STRESS_FRAMES)
+    handle_player_collisions = COLLISION_SOLVERS["grid"]
+    start = time.perf_counter()
+    for _ in range(STRESS_FRAMES):
+        with profiler.section("players"):
+            players.update()
+        with profiler.section("collisions"):
+            handle_player_collisions(players, COLLISION_DISTANCE, rng)
+        profiler.end_frame()
+    seconds = time.perf_counter() - start
+
+    return make_result(STRESS_FRAMES, seconds, profiler)
+
+
+def bench_field(teams: list[Team]) -> dict:
+    """Draw the field from scratch, as a first start does"""
+    profiler = FrameProfiler(window=FIELD_BUILDS)
+    start = time.perf_counter()
+    for _ in range(FIELD_BUILDS):
+        with profiler.section("field"):
+            Field(use_cache=False)
+        profiler.end_frame()
+    seconds = time.perf_counter() - start
+
+    return make_result(FIELD_BUILDS, seconds, profiler)
+
+
+def bench_field_cached(teams: list[Team]) -> dict:
+    """Load the field from the disk cache, as every later start does"""
+    Field()  # make sure the cache is warm
+
+    profiler = FrameProfiler(window=FIELD_BUILDS)
+    start = time.perf_counter()
+    for _ in range(FIELD_BUILDS):
+        with profiler.section("field"):
+            Field()
+        profiler.end_frame()
+    seconds = time.perf_counter() - start
+
+    return make_result(FIELD_BUILDS, seconds, profiler)
+
+
+def bench_roster_load(teams: list[Team]) -> dict:
+    profiler = FrameProfiler(window=ROSTER_LOADS)
+    start = time.perf_counter()
+    for _ in range(ROSTER_LOADS):
+        with profiler.section("load_teams"):
+            load_teams()
+        profiler.end_frame()
+    seconds = time.perf_counter() - start
+
+    return make_result(ROSTER_LOADS, seconds, profiler)
+
+
+def bench_roster_store(teams: list[Team]) -> dict:
+    """Open the indexed store and load one team, as main.py does"""
+    RosterStore().get("Warforge")  # make sure the cache is warm
+
+    profiler = FrameProfiler(window=ROSTER_LOADS)
+    start = time.perf_counter()
+    for _ in range(ROSTER_LOADS):
+        with profiler.section("roster_store"):
+            RosterStore().get("Warforge")
+        profiler.end_frame()
+    seconds = time.perf_counter() - start
+
+    return make_result(ROSTER_LOADS, seconds, profiler)
+
+
+def bench_league(teams: list[Team]) -> dict:
+    profiler = FrameProfiler(window=LEAGUE_BUILDS)
+    start = time.perf_counter()
+    for i in range(LEAGUE_BUILDS):
+        with profiler.section("generate_league"):
+            generate_league(LEAGUE_TEAMS, seed=SEED + i)
+        profiler.end_frame()
+    seconds = time.perf_counter() - start
+
+    return make_result(LEAGUE_BUILDS, seconds, profiler)
+
+
+SCENARIOS: dict[str, Callable[[list[Team]], dict]] = {
+    **{
+        f"play_{play}": (lambda teams, play=play: bench_play(teams, play))
+        for play in range(len(PLAYS))
+    },
+    **{
+        f"pileup_22_{solver}": (
+            lambda teams, solver=solver: bench_pileup(teams, solver)
+        )
+        for solver in COLLISION_SOLVERS
+    },
+    f"stress_{STRESS_PLAYERS}": bench_stress,
+    "field": bench_field,
+    "field_cached": bench_field_cached,
+    "roster_load": bench_roster_load,
+    "roster_store": bench_roster_store,
+    f"league_{LEAGUE_TEAMS}": bench_league,
+}
@@ -0,0 +1,132 @@
+import math
+
+import pygame
+
+from config import CAMERA_FOLLOW_RATE, CAMERA_ZOOM_LEVELS, FIELD_HEIGHT, FIELD_WIDTH
+from field import Field
+
+# Side of a field tile in screen pixels. Every zoom level has to map it to a
+# whole number of field pixels, so tiles line up without seams.
+TILE_SIZE = 256
+
+
+class FieldTiles:
+    """Field image pre-scaled to each zoom level, built lazily a tile at a time
+
+    Only tiles that come into view are ever scaled, so close zoom levels
+    don't hold a full-size copy of the field in memory.
+    """
+
+    def __init__(self, field: Field, zoom_levels: tuple[float, ...]):
+        for zoom in zoom_levels:
+            if (TILE_SIZE / zoom) % 1:
+                raise ValueError(f"Zoom {zoom} doesn't divide the tile size")
+        self.field = field
+        self.zoom_levels = zoom_levels
+        self.tiles: dict[tuple[float, int, int], pygame.Surface] = {}
+
+    def get_tile(self, zoom: float, column: int, row: int) -> pygame.Surface:
+        key = (zoom, column, row)
+        tile = self.tiles.get(key)
+        if tile is None:
+            span = int(TILE_SIZE / zoom)
+            area = pygame.Rect(column * span, row * span, span, span).clip(
+                self.field.rect
+            )
+            source = self.field.image.subsurface(area)
+            size = (round(area.width * zoom), round(area.height * zoom))
+            # Shrinking needs filtering, enlarging stays crisp without it
+            if zoom < 1:
+                tile = pygame.transform.smoothscale(source, size)
+            else:
+                tile = pygame.transform.scale(source, size)
+            self.tiles[key] = tile
+        return tile
+
+    def draw(self, surface: pygame.Surface, camera: "Camera"):
+        zoom = camera.zoom
+        span = TILE_SIZE / zoom
+        view = camera.view_rect.clip(self.field.rect)
+        if view.width == 0 or view.height == 0:
+            return
+
+        first_column, first_row = int(view.left // span), int(view.top // span)
+        last_column = int((view.right - 1) // span)
+        last_row = int((view.bottom - 1) // span)
+        for row in range(first_row, last_row + 1):
+            for column in range(first_column, last_column + 1):
+                tile = self.get_tile(zoom, column, row)
+                pos = camera.world_to_screen(pygame.Vector2(column, row) * span)
+                # Floor both edges the same way so neighbouring tiles meet
+                surface.blit(tile, (math.floor(pos.x), math.floor(pos.y)))
+
+
+class Camera:
+    """Maps field coordinates onto a viewport that pans and zooms"""
+
+    def __init__(
+        self,
+        viewport_size: tuple[int, int],
+        zoom_levels: tuple[float, ...] = CAMERA_ZOOM_LEVELS,
+        follow_rate: float = CAMERA_FOLLOW_RATE,
+    ):
+        self.viewport_size = pygame.Vector2(viewport_size)
+        self.zoom_levels = zoom_levels
+        self.zoom_index = zoom_levels.index(1) if 1 in zoom_levels else 0
+        # Fraction of the distance to the target covered each frame
+        self.follow_rate = follow_rate
+        self.center = pygame.Vector2(FIELD_WIDTH / 2, FIELD_HEIGHT / 2)
+
+    @property
+    def zoom(self) -> float:
+        return self.zoom_levels[self.zoom_index]
+
+    def zoom_in(self):
+        self.zoom_index = min(self.zoom_index + 1, len(self.zoom_levels) - 1)
+        self.clamp()
+
+    def zoom_out(self):
+        self.zoom_index = max(self.zoom_index - 1, 0)
+        self.clamp()
+
+    @property
+    def view_size(self) -> pygame.Vector2:
+        return self.viewport_size / self.zoom
+
+    @property
+    def view_rect(self) -> pygame.Rect:
+        """Area of the field in view, in field coordinates"""
+        size = self.view_size
+        rect = pygame.Rect(0, 0, size.x + 1, size.y + 1)
+        rect.center = self.center
+        return rect
+
+    def clamp(self):
+        """Keep the view on the field, centering the field when it fits"""
+        half = self.view_size / 2
+        for axis, length in ((0, FIELD_WIDTH), (1, FIELD_HEIGHT)):
+            if half[axis] * 2 >= length:
+                self.center[axis] = length / 2
+            else:
+                self.center[axis] = min(
+                    max(self.center[axis], half[axis]), length - half[axis]
+                )
+
+    def follow(self, target: pygame.Vector2):
+        self.center += (target - self.center) * self.follow_rate
+        self.clamp()
+
+    def world_to_screen(self, pos: pygame.Vector2) -> pygame.Vector2:
+        return (pos - self.center) * self.zoom + self.viewport_size / 2
+
+    def screen_to_world(self, pos: pygame.Vector2) -> pygame.Vector2:
+        return (pygame.Vector2(pos) - self.viewport_size / 2) / self.zoom + self.center
+
+    def rect_to_screen(self, rect: pygame.Rect) -> pygame.Rect:
+        topleft = self.world_to_screen(pygame.Vector2(rect.topleft))
+        return pygame.Rect(
+            round(topleft.x),
+            round(topleft.y),
+            round(rect.width * self.zoom),
+            round(rect.height * self.zoom),
+        )
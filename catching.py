@@ -0,0 +1,96 @@
+import math
+
+from ball import Ball, BallFlight
+from config import BALL_RADIUS, CATCH_MAX_HEIGHT, CATCH_RADIUS, CATCH_WINDOW_PADDING
+from player import Player
+
+
+class CatchWindow:
+    """Flight frames in which a receiver is predicted to be able to catch"""
+
+    def __init__(self, receiver: Player, intervals: list[tuple[int, int]]):
+        self.receiver = receiver
+        # Inclusive (first, last) flight frames
+        self.intervals = intervals
+        # Predictions are stale once the receiver's motion changes
+        self.motion_version = receiver.motion_version
+
+    @property
+    def first_frame(self) -> int:
+        return self.intervals[0][0] if self.intervals else math.inf
+
+    def is_stale(self) -> bool:
+        return self.motion_version != self.receiver.motion_version
+
+    def contains(self, frame: int) -> bool:
+        for first, last in self.intervals:
+            if first <= frame <= last:
+                return True
+        return False
+
+    def __repr__(self):
+        return f"CatchWindow({self.receiver}, intervals={self.intervals})"
+
+
+def catchable_frames(flight: BallFlight, start: int = 1) -> list[tuple[int, int]]:
+    """Flight frames >= start where the ball is below CATCH_MAX_HEIGHT
+
+    z(k) = k * v - g * k * (k - 1) / 2 is above the catch height only
+    between the roots of g/2 k^2 - (v + g/2) k + H = 0. The boundary frames
+    are kept so rounding never drops a catchable frame.
+    """
+    # Lob throws can have a fractional frame count, the ball still flies
+    # until frames_left runs out
+    n_frames = math.ceil(flight.n_frames)
+    a = flight.z_gravity / 2
+    b = -(flight.z_velocity + flight.z_gravity / 2)
+    c = CATCH_MAX_HEIGHT
+    discriminant = b * b - 4 * a * c
+
+    if a == 0 or discriminant < 0:
+        intervals = [(1, n_frames)]
+    else:
+        root = math.sqrt(discriminant)
+        rising = (-b - root) / (2 * a)
+        falling = (-b + root) / (2 * a)
+        if math.ceil(rising) + 1 >= math.floor(falling):
+            intervals = [(1, n_frames)]
+        else:
+            intervals = [
+                (1, math.ceil(rising)),
+                (math.floor(falling), n_frames),
+            ]
+
+    return [
+        (max(first, start), last)
+        for first, last in intervals
+        if last >= max(first, start)
+    ]
+
+
+def predict_catch_window(receiver: Player, ball: Ball) -> CatchWindow:
+    """Frames where the receiver's predicted path meets the catchable ball"""
+    flight = ball.flight
+    intervals = []
+    if flight is None:
+        return CatchWindow(receiver, intervals)
+
+    reach = CATCH_RADIUS + BALL_RADIUS + CATCH_WINDOW_PADDING
+    for first, last in catchable_frames(flight, max(1, ball.flight_frame)):
+        run_start = None
+        for frame in range(first, last + 1):
+            ball_pos = flight.position_at(frame)
+            receiver_pos = receiver.estimate_position(frame - ball.flight_frame)
+            in_reach = (
+                abs(ball_pos.x - receiver_pos.x) <= reach
+                and abs(ball_pos.y - receiver_pos.y) <= reach
+            )
+            if in_reach and run_start is None:
+                run_start = frame
+            elif not in_reach and run_start is not None:
+                intervals.append((run_start, frame - 1))
+                run_start = None
+        if run_start is not None:
+            intervals.append((run_start, last))
+
+    return CatchWindow(receiver, intervals)
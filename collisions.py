@@ -0,0 +1,292 @@
+import math
+import random
+from typing import Optional
+
+import numpy as np
+import pygame
+
+from config import COLLISION_NUDGE, COLLISION_REPULSION_FACTOR
+from player import Player
+from player_state import PlayerState
+
+
+def push_apart(
+    v1: pygame.Vector2,
+    v2: pygame.Vector2,
+    momentum_coefficients: tuple[float, float],
+    push_factors: tuple[float, float],
+    offset: pygame.Vector2,
+    distance: float,
+    min_distance: float,
+    rng: random.Random,
+):
+    """Push two overlapping players apart, changing v1 and v2 in place"""
+    repulse = offset.normalize()
+
+    # Add a small random "bobble" nudge
+    angle = rng.uniform(-1 * COLLISION_NUDGE, COLLISION_NUDGE)
+    repulse = repulse.rotate(math.degrees(angle))
+
+    move_amount = (min_distance - distance) / 2
+
+    p1_momentum = momentum_coefficients[0] * v1.length()
+    p2_momentum = momentum_coefficients[1] * v2.length()
+
+    # prevent division by zero
+    total_momentum = p1_momentum + p2_momentum + 1e-5
+
+    p1_push = (p2_momentum / total_momentum) * push_factors[0]
+    p2_push = (p1_momentum / total_momentum) * push_factors[1]
+
+    repulse_vector = repulse * move_amount * COLLISION_REPULSION_FACTOR
+    v1 += repulse_vector * p1_push
+    v2 -= repulse_vector * p2_push
+
+
+def resolve_collision(
+    p1: Player,
+    p2: Player,
+    offset: pygame.Vector2,
+    distance: float,
+    min_distance: float,
+    rng: random.Random,
+):
+    velocity_1, velocity_2 = p1.velocity, p2.velocity
+    push_apart(
+        velocity_1,
+        velocity_2,
+        (p1.momentum_coefficient, p2.momentum_coefficient),
+        (p1.push_factor, p2.push_factor),
+        offset,
+        distance,
+        min_distance,
+        rng,
+    )
+    # Bound players hand out copies, store the results back
+    p1.velocity = velocity_1
+    p2.velocity = velocity_2
+    p1.motion_version += 1
+    p2.motion_version += 1
+
+
+def get_bound_state(player_list: list[Player]) -> Optional[PlayerState]:
+    """The PlayerState holding exactly these players, if there is one"""
+    if not player_list:
+        return None
+    state = player_list[0].state
+    if state is not None and state.players == player_list:
+        return state
+    return None
+
+
+def resolve_bound_pairs(
+    state: PlayerState,
+    pairs,
+    positions: list[pygame.Vector2],
+    min_distance: float,
+    rng: random.Random,
+):
+    """Resolve contact pairs against a bound state's arrays
+
+    Velocities are read once, updated pair after pair like the per-player
+    path, and written back in one go.
+    """
+    velocities = [pygame.Vector2(v) for v in state.velocity.tolist()]
+    momentum_coefficient = state.momentum_coefficient.tolist()
+    push_factor = state.push_factor.tolist()
+    touched = set()
+    for i, j in pairs:
+        offset = positions[i] - positions[j]
+        distance = offset.length()
+        if distance < min_distance and distance > 0:
+            push_apart(
+                velocities[i],
+                velocities[j],
+                (momentum_coefficient[i], momentum_coefficient[j]),
+                (push_factor[i], push_factor[j]),
+                offset,
+                distance,
+                min_distance,
+                rng,
+            )
+            touched.add(i)
+            touched.add(j)
+
+    if touched:
+        slots = sorted(touched)
+        state.velocity[slots] = [tuple(velocities[slot]) for slot in slots]
+        for slot in slots:
+            state.players[slot].motion_version += 1
+
+
+def handle_player_collisions(
+    players: list[Player], min_distance: float, rng: random.Random = random
+):
+    player_list = list(players)
+    state = get_bound_state(player_list)
+    if state is not None:
+        n = len(player_list)
+        pairs = ((i, j) for i in range(n) for j in range(i + 1, n))
+        positions = [pygame.Vector2(p) for p in state.pos.tolist()]
+        resolve_bound_pairs(state, pairs, positions, min_distance, rng)
+        return
+
+    for i in range(len(player_list)):
+        for j in range(i + 1, len(player_list)):
+            p1 = player_list[i]
+            p2 = player_list[j]
+            offset = p1.pos - p2.pos
+            distance = offset.length()
+            if distance < min_distance and distance > 0:
+                resolve_collision(p1, p2, offset, distance, min_distance, rng)
+
+
+# Neighbouring cells that are checked from each cell. Only half of the 3x3
+# neighbourhood is needed since the other half checks back the other way.
+NEIGHBOUR_CELLS = [(1, -1), (1, 0), (1, 1), (0, 1)]
+
+
+def get_nearby_pairs(
+    positions: list[pygame.Vector2], cell_size: float
+) -> list[tuple[int, int]]:
+    """Index pairs (i < j) sharing or neighbouring a spatial hash cell
+
+    With cell_size >= the collision distance every colliding pair is
+    returned. Pairs are sorted so they resolve in the same order as the
+    brute force loop.
+    """
+    cells: dict[tuple[int, int], list[int]] = {}
+    for i, pos in enumerate(positions):
+        cell = (math.floor(pos.x / cell_size), math.floor(pos.y / cell_size))
+        cells.setdefault(cell, []).append(i)
+
+    pairs = []
+    for (cell_x, cell_y), members in cells.items():
+        for a in range(len(members)):
+            for b in range(a + 1, len(members)):
+                pairs.append((members[a], members[b]))
+
+        for dx, dy in NEIGHBOUR_CELLS:
+            neighbours = cells.get((cell_x + dx, cell_y + dy))
+            if neighbours is None:
+                continue
+            for i in members:
+                for j in neighbours:
+                    pairs.append((i, j) if i < j else (j, i))
+
+    pairs.sort()
+    return pairs
+
+
+def handle_player_collisions_grid(
+    players: list[Player], min_distance: float, rng: random.Random = random
+):
+    """Spatial hash broadphase version of handle_player_collisions
+
+    Produces identical results, including the order random nudges are drawn.
+    """
+    player_list = list(players)
+    state = get_bound_state(player_list)
+    if state is not None:
+        positions = [pygame.Vector2(p) for p in state.pos.tolist()]
+        pairs = get_nearby_pairs(positions, min_distance)
+        resolve_bound_pairs(state, pairs, positions, min_distance, rng)
+        return
+
+    positions = [player.pos for player in player_list]
+
+    for i, j in get_nearby_pairs(positions, min_distance):
+        offset = positions[i] - positions[j]
+        distance = offset.length()
+        if distance < min_distance and distance > 0:
+            resolve_collision(
+                player_list[i], player_list[j], offset, distance, min_distance, rng
+            )
+
+
+def handle_player_collisions_batch(
+    players: list[Player], min_distance: float, rng: random.Random = random
+):
+    """Array version of handle_player_collisions
+
+    All contact pairs are resolved at once against the velocities from the
+    start of the pass, rather than one pair after another, so results differ
+    slightly from the other solvers. Random nudges are drawn in pair order,
+    so runs are reproducible with a fixed seed.
+    """
+    player_list = list(players)
+    n = len(player_list)
+    if n < 2:
+        return
+
+    state = get_bound_state(player_list)
+    if state is not None:
+        # Work directly on the bound arrays
+        pos = state.pos
+        velocity = state.velocity
+        momentum_coefficient = state.momentum_coefficient
+        push_factor = state.push_factor
+    else:
+        pos = np.array([(p.pos.x, p.pos.y) for p in player_list])
+        velocity = np.array([(p.velocity.x, p.velocity.y) for p in player_list])
+        momentum_coefficient = np.array([p.momentum_coefficient for p in player_list])
+        push_factor = np.array([p.push_factor for p in player_list])
+
+    # Contact pairs (i < j) in the same order as the pairwise loop
+    dx = pos[:, 0, None] - pos[None, :, 0]
+    dy = pos[:, 1, None] - pos[None, :, 1]
+    distance_squared = dx * dx + dy * dy
+    contact = (distance_squared < min_distance**2) & (distance_squared > 0)
+    i, j = np.nonzero(np.triu(contact, 1))
+    if len(i) == 0:
+        return
+
+    offset = np.stack((dx[i, j], dy[i, j]), axis=1)
+    distance = np.sqrt(distance_squared[i, j])
+    repulse = offset / distance[:, None]
+
+    # Add a small random "bobble" nudge
+    angle = np.array(
+        [rng.uniform(-1 * COLLISION_NUDGE, COLLISION_NUDGE) for _ in range(len(i))]
+    )
+    cos, sin = np.cos(angle), np.sin(angle)
+    repulse = np.stack(
+        (
+            repulse[:, 0] * cos - repulse[:, 1] * sin,
+            repulse[:, 0] * sin + repulse[:, 1] * cos,
+        ),
+        axis=1,
+    )
+
+    move_amount = (min_distance - distance) / 2
+
+    momentum = momentum_coefficient * np.hypot(velocity[:, 0], velocity[:, 1])
+    p1_momentum = momentum[i]
+    p2_momentum = momentum[j]
+
+    # prevent division by zero
+    total_momentum = p1_momentum + p2_momentum + 1e-5
+
+    p1_push = (p2_momentum / total_momentum) * push_factor[i]
+    p2_push = (p1_momentum / total_momentum) * push_factor[j]
+
+    repulse_vector = repulse * (move_amount * COLLISION_REPULSION_FACTOR)[:, None]
+    delta = np.zeros_like(velocity)
+    np.add.at(delta, i, repulse_vector * p1_push[:, None])
+    np.subtract.at(delta, j, repulse_vector * p2_push[:, None])
+
+    if state is not None:
+        velocity += delta
+
+    for slot in np.unique(np.concatenate((i, j))):
+        player = player_list[slot]
+        if state is None:
+            player.velocity += pygame.Vector2(*delta[slot])
+        player.motion_version += 1
+
+
+COLLISION_SOLVERS = {
+    "pairwise": handle_player_collisions,
+    "grid": handle_player_collisions_grid,
+    "batch": handle_player_collisions_batch,
+}
@@ -29,6 +29,8 @@ HALO_RADIUS = PLAYER_RADIUS * 1.5
 COLLISION_DISTANCE = PLAYER_RADIUS * 2
 COLLISION_NUDGE = 1
 COLLISION_REPULSION_FACTOR = 1
+# One of collisions.COLLISION_SOLVERS ("pairwise", "grid" or "batch")
+COLLISION_SOLVER = "grid"
 
 # MOVEMENT PARAMETERS
 
@@ -66,5 +68,20 @@ THROW_ARC_DIVISOR = 6
 CATCH_MAX_HEIGHT = YARD_LENGTH * 2.33
 # How close (in pixels) the ball must be to the player to be catchable
 CATCH_RADIUS = PLAYER_RADIUS * 2
+# Slack (in pixels) when predicting catch windows, covers estimate error
+CATCH_WINDOW_PADDING = PLAYER_RADIUS
 # If True, catching stat has no effect
 PERFECT_CATCHING = False
+
+# RENDERING
+
+# Redraw only the areas that changed and update them with display.update(rects)
+# instead of redrawing and flipping the whole screen every frame
+DIRTY_RECT_RENDERING = False
+# Draw routes, catch radii and the ball landing marker
+DEBUG_OVERLAYS = True
+# Pan and zoom a camera that follows the ball instead of drawing the field 1:1
+CAMERA_ENABLED = False
+# Each level must divide camera.TILE_SIZE into whole field pixels
+CAMERA_ZOOM_LEVELS = (0.5, 1, 2, 4)
+CAMERA_FOLLOW_RATE = 0.1
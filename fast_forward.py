@@ -0,0 +1,272 @@
+import math
+from functools import cache
+
+import numpy as np
+import pygame
+
+from config import DECELERATION_RATE
+from player import Player
+
+# Velocities below this are snapped to zero by Player.move
+MIN_SPEED = 0.1
+# Largest angle (radians) between a skip's held heading and the direction
+# update_route would re-aim a route runner in
+HEADING_TOLERANCE = 1e-3
+
+
+def get_heading(player: Player) -> pygame.Vector2:
+    """Direction the player will move in next frame (as update_route sets it)"""
+    if player.running_route and len(player.route) > 0:
+        offset = player.route[player.route_index] - player.pos
+        if offset.length() > 0:
+            return offset.normalize()
+    return player.direction
+
+
+def get_target_velocity(player: Player, heading: pygame.Vector2) -> pygame.Vector2:
+    """Velocity the player's velocity closes in on while heading is held"""
+    if heading.length() > 0:
+        return heading * player.max_speed
+    return pygame.Vector2(0, 0)
+
+
+def get_travelled(
+    player: Player, heading: pygame.Vector2, frames: int
+) -> pygame.Vector2:
+    """Distance covered in `frames` calls of update() with heading held"""
+    velocity = player.velocity
+    if heading.length() > 0:
+        # velocity(k) = target + (velocity - target) * retained^k
+        if player.acceleration_factor <= 0:
+            return velocity * frames
+        retained = 1 - player.acceleration_factor
+        target_velocity = heading * player.max_speed
+        return target_velocity * frames + (velocity - target_velocity) * (
+            retained * (1 - retained**frames) / player.acceleration_factor
+        )
+    return velocity * (
+        DECELERATION_RATE * (1 - DECELERATION_RATE**frames) / (1 - DECELERATION_RATE)
+    )
+
+
+def get_lowest_speed(player: Player, heading: pygame.Vector2) -> float:
+    """Lowest speed over the next frames while heading is held
+
+    Every velocity from the next frame on lies on the segment between next
+    frame's velocity and the target, so this is the segment's distance from
+    zero.
+    """
+    target = get_target_velocity(player, heading)
+    start = player.velocity + (target - player.velocity) * player.acceleration_factor
+    segment = target - start
+    length_squared = segment.length_squared()
+    if length_squared == 0:
+        return start.length()
+    t = min(max(-start.dot(segment) / length_squared, 0), 1)
+    return (start + segment * t).length()
+
+
+def route_point_horizon(
+    player: Player, heading: pygame.Vector2, distance: float
+) -> int:
+    """Frames that can pass before update_route sees the route point in reach
+
+    update_route switches points once the point is less than max_speed away,
+    checking the position from before each frame's move, so skipping k
+    frames is safe while the distance left after k - 1 frames is at least
+    max_speed.
+    """
+    reach = distance - player.max_speed
+    if reach < 0:
+        return 0
+
+    def covered(frames: int) -> float:
+        return heading.dot(get_travelled(player, heading, frames))
+
+    # Start from the steady state speed and correct for the transient
+    frames = max(int(reach / player.max_speed), 0)
+    while frames > 0 and covered(frames) > reach:
+        frames -= 1
+    while covered(frames + 1) <= reach:
+        frames += 1
+    return frames + 1
+
+
+def aim_horizon(
+    player: Player, heading: pygame.Vector2, distance: float, frames: int
+) -> int:
+    """Frames, up to `frames`, a route runner can be skipped with heading held
+
+    update_route re-aims at the route point every frame, a skip doesn't.
+    The two only agree while the player runs along the line to the point,
+    so the velocity has to be within HEADING_TOLERANCE of the heading, and
+    the skip ends before the sideways drift turns the bearing to the point
+    by more than that.
+    """
+    speed = player.velocity.length()
+    if abs(player.velocity.cross(heading)) > HEADING_TOLERANCE * speed:
+        return 0
+
+    def aimed(frames: int) -> bool:
+        travelled = get_travelled(player, heading, frames)
+        left = distance - heading.dot(travelled)
+        return abs(travelled.cross(heading)) <= HEADING_TOLERANCE * left
+
+    if aimed(frames):
+        return frames
+    # Drift only grows and the distance left only shrinks, so bisect
+    low, high = 0, frames
+    while high - low > 1:
+        middle = (low + high) // 2
+        if aimed(middle):
+            low = middle
+        else:
+            high = middle
+    return low
+
+
+def player_horizon(player: Player) -> float:
+    """Frames the player can be advanced in closed form without an event
+
+    Events are a route point being reached, the reaction timer running out
+    and a coasting player's velocity snapping to zero. Route runners are
+    also held to the frames where re-aiming wouldn't change their heading.
+    """
+    horizon = math.inf
+    speed = player.velocity.length()
+    heading = get_heading(player)
+
+    if player.reaction_timer > 0:
+        horizon = player.reaction_timer - 1
+
+    if heading.length() > 0:
+        # The closed form holds while the speed stays between MIN_SPEED and
+        # max_speed, so neither the clamp nor the snap to zero kicks in
+        if speed > player.max_speed or player.velocity.dot(heading) < 0:
+            return 0
+        if get_lowest_speed(player, heading) < MIN_SPEED:
+            return 0
+
+        if player.running_route and len(player.route) > 0:
+            distance = (player.route[player.route_index] - player.pos).length()
+            frames = route_point_horizon(player, heading, distance)
+            horizon = min(horizon, aim_horizon(player, heading, distance, frames))
+        return horizon
+
+    if speed == 0:
+        return horizon
+
+    # Coasting, speed decays by DECELERATION_RATE until it drops below MIN_SPEED
+    if speed < MIN_SPEED:
+        return 0
+    stop_frame = (
+        math.floor(math.log(MIN_SPEED / speed) / math.log(DECELERATION_RATE)) + 1
+    )
+    return min(horizon, stop_frame - 1)
+
+
+@cache
+def get_pairs(n_players: int) -> tuple[np.ndarray, np.ndarray]:
+    """Indices (i < j) of every pair of n players"""
+    return np.triu_indices(n_players, 1)
+
+
+def get_motion(player: Player) -> tuple[float, ...]:
+    """Position, velocity, target velocity, steady velocity and drift of a skip
+
+    With heading held, the velocity moves along the segment from the
+    current velocity to the target. The distance covered in k frames is
+    steady * k plus (velocity - steady) times a factor that grows towards a
+    limit, so the player never strays further than the drift from
+    pos + steady * k.
+    """
+    heading = get_heading(player)
+    velocity = player.velocity
+    target = get_target_velocity(player, heading)
+    if heading.length() > 0:
+        if player.acceleration_factor <= 0:
+            steady, limit = velocity, 0
+        else:
+            steady = target
+            limit = (1 - player.acceleration_factor) / player.acceleration_factor
+    else:
+        steady = target
+        limit = DECELERATION_RATE / (1 - DECELERATION_RATE)
+    drift = (velocity - steady).length() * limit
+    return (
+        *player.pos,
+        *velocity,
+        *target,
+        *steady,
+        drift,
+    )
+
+
+def collision_horizon(players: list[Player], min_distance: float) -> float:
+    """Frames that can be skipped in closed form before any two players collide
+
+    Holds for a skip from the current state, with headings held. Each pair
+    gets the better of two bounds: the speed at which the pair can close,
+    which is at most the largest distance between the ends of the segments
+    their velocities move along, and the first frame at which the pair's
+    steady paths, widened by each player's drift, meet. Players running side
+    by side or apart then don't hold up the skip.
+    """
+    if len(players) < 2:
+        return math.inf
+
+    motion = np.array([get_motion(p) for p in players])
+    i, j = get_pairs(len(players))
+    offset = motion[i, 0:2] - motion[j, 0:2]
+    distance = np.hypot(offset[:, 0], offset[:, 1])
+    # Coinciding players are skipped by the solvers
+    gap = np.where(distance > 0, distance - min_distance, np.inf)
+    # Overlapping pairs are resolved (and draw a random nudge) every frame,
+    # even when neither player is moving
+    if np.any(gap < 0):
+        return 0
+
+    # Both ends of each player's velocity segment against both of the other's
+    ends = motion[:, 2:6].reshape(-1, 2, 2)
+    relative = ends[i][:, :, None, :] - ends[j][:, None, :, :]
+    closing = np.sqrt(np.square(relative).sum(axis=3)).max(axis=(1, 2))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        horizon = np.where(closing > 0, np.floor(gap / closing), np.inf)
+
+        # First k where |offset + relative * k| < min_distance + drift
+        relative = motion[i, 6:8] - motion[j, 6:8]
+        reach = min_distance + motion[i, 8] + motion[j, 8]
+        a = np.square(relative).sum(axis=1)
+        b = (offset * relative).sum(axis=1)
+        c = np.square(offset).sum(axis=1) - np.square(reach)
+        discriminant = np.square(b) - a * c
+        meets = (a > 0) & (b < 0) & (discriminant >= 0)
+        first = (-b - np.sqrt(np.maximum(discriminant, 0))) / a
+        paths = np.where(c <= 0, 0, np.where(meets, np.floor(first), np.inf))
+    return float(np.min(np.maximum(horizon, paths)))
+
+
+def advance_player(player: Player, frames: int):
+    """Apply `frames` calls of update() at once, assuming no events in between"""
+    if player.reaction_timer > 0:
+        player.reaction_timer -= frames
+
+    heading = get_heading(player)
+    velocity = player.velocity
+
+    if heading.length() > 0:
+        retained = 1 - player.acceleration_factor
+        target_velocity = heading * player.max_speed
+        travelled = get_travelled(player, heading, frames)
+        player.direction = heading
+        player.velocity = target_velocity + (velocity - target_velocity) * (
+            retained**frames
+        )
+    elif velocity.length() > 0:
+        travelled = get_travelled(player, heading, frames)
+        player.velocity = velocity * DECELERATION_RATE**frames
+    else:
+        return
+
+    player.set_pos(player.pos + travelled)
@@ -1,3 +1,7 @@
+import hashlib
+import os
+from pathlib import Path
+
 import pygame
 
 from colors import get_color
@@ -11,14 +15,65 @@ from config import (
     GOAL_POST_WIDTH,
     YARD_LENGTH,
 )
+from fonts import get_font
+
+FIELD_CACHE_DIR = Path(__file__).parent / ".cache"
+
+
+def get_cache_key() -> str:
+    """Changes whenever the rendered field could look different"""
+    key = hashlib.sha1()
+    for value in (
+        FIELD_WIDTH,
+        FIELD_HEIGHT,
+        FIELD_YARDS,
+        YARD_LENGTH,
+        FIELD_HASH_LENGTH,
+        FIELD_HASH_DISTANCE,
+        GOAL_POST_WIDTH,
+        tuple(FIELD_CENTER),
+        pygame.version.ver,
+    ):
+        key.update(repr(value).encode())
+    # Drawing code and colors
+    for module in ("field.py", "colors.py"):
+        key.update((Path(__file__).parent / module).read_bytes())
+    return key.hexdigest()[:16]
 
 
 class Field:
-    def __init__(self):
+    def __init__(self, use_cache: bool = True):
         self.image = pygame.Surface((FIELD_WIDTH, FIELD_HEIGHT))
         self.rect = self.image.get_rect(topleft=(0, 0))
 
-        self.draw(self.image)
+        if not (use_cache and self.load_cached()):
+            self.draw(self.image)
+            if use_cache:
+                self.save_cached()
+
+    @property
+    def cache_path(self) -> Path:
+        return FIELD_CACHE_DIR / f"field-{get_cache_key()}.rgb"
+
+    def load_cached(self) -> bool:
+        try:
+            data = self.cache_path.read_bytes()
+            image = pygame.image.frombuffer(data, self.image.get_size(), "RGB")
+        except (OSError, ValueError):
+            return False
+        self.image.blit(image, (0, 0))
+        return True
+
+    def save_cached(self):
+        path = self.cache_path
+        try:
+            path.parent.mkdir(exist_ok=True)
+            # Write then rename, so a concurrent start never reads half a file
+            temp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            temp_path.write_bytes(pygame.image.tobytes(self.image, "RGB"))
+            os.replace(temp_path, path)
+        except OSError:
+            pass
 
     def draw(self, surface: pygame.Surface):
         pygame.draw.rect(
@@ -86,7 +141,7 @@ class Field:
             start_x = 10 * YARD_LENGTH
             x = yard * YARD_LENGTH + start_x
 
-            font = pygame.font.SysFont(None, int(FIELD_HEIGHT // 12))
+            font = get_font(None, int(FIELD_HEIGHT // 12))
             number = (
                 yard if yard <= (FIELD_YARDS - 20) / 2 else (FIELD_YARDS - 20) - yard
             )
@@ -0,0 +1,14 @@
+from functools import cache
+from typing import Optional
+
+import pygame
+
+
+@cache
+def get_font(
+    face: Optional[str], size: int, bold: bool = False, italic: bool = False
+) -> pygame.font.Font:
+    """System font for (face, size), resolved once per process"""
+    if not pygame.font.get_init():
+        pygame.font.init()
+    return pygame.font.SysFont(face, size, bold, italic)
@@ -0,0 +1,228 @@
+import argparse
+import multiprocessing
+import os
+from abc import ABC, abstractmethod
+from typing import Optional
+
+import pygame
+
+from config import FRAME_RATE, THROW_MIN_FRAMES, THROW_SPEED, YARD_LENGTH
+from simulation import PLAYS, Simulation
+from rng import spawn_seeds
+from team import RosterStore, Team
+from utils import get_yard_x
+
+RECEIVER_SLOTS = ["wr_1", "wr_2", "wr_3", "te", "hb"]
+PASS_RESULTS = {"catch", "drop", "incomplete"}
+
+
+class ThrowPolicy(ABC):
+    """Decides when the quarterback throws and where the ball is aimed"""
+
+    def __init__(self, throw_after: int = FRAME_RATE, lob: bool = False):
+        # Frames between the snap and the throw
+        self.throw_after = throw_after
+        self.lob = lob
+
+    @abstractmethod
+    def choose_receiver(self, sim: Simulation) -> str:
+        """Slot of the receiver to throw to"""
+
+    def lead_target(self, sim: Simulation, slot: str) -> pygame.Vector2:
+        """Where the receiver will be when a throw at them arrives"""
+        receiver = getattr(sim, slot)
+        passer = sim.ball_carrier
+        throw_speed = max(2, THROW_SPEED * (passer.record.throw_power / 100))
+        if self.lob:
+            throw_speed *= 0.7
+
+        # Flight time depends on the target, so refine it a couple of times
+        target = receiver.pos.copy()
+        for _ in range(3):
+            distance = (target - sim.ball.pos).length()
+            flight_frames = max(THROW_MIN_FRAMES, int(distance / throw_speed))
+            target = receiver.estimate_position(flight_frames)
+        return target
+
+    def target(self, sim: Simulation) -> tuple[str, pygame.Vector2]:
+        slot = self.choose_receiver(sim)
+        return slot, self.lead_target(sim, slot)
+
+
+class ThrowToReceiver(ThrowPolicy):
+    def __init__(self, slot: str, throw_after: int = FRAME_RATE, lob: bool = False):
+        super().__init__(throw_after, lob)
+        self.slot = slot
+
+    def choose_receiver(self, sim: Simulation) -> str:
+        return self.slot
+
+
+class ThrowToDeepest(ThrowPolicy):
+    def choose_receiver(self, sim: Simulation) -> str:
+        return max(RECEIVER_SLOTS, key=lambda slot: getattr(sim, slot).pos.x)
+
+
+class ThrowToRandom(ThrowPolicy):
+    def choose_receiver(self, sim: Simulation) -> str:
+        return sim.rng.choice(RECEIVER_SLOTS)
+
+
+POLICIES = {
+    "deepest": ThrowToDeepest,
+    "random": ThrowToRandom,
+}
+
+# Per-process state, set up once by init_worker
+worker_simulation: Optional[Simulation] = None
+worker_policy: Optional[ThrowPolicy] = None
+worker_play = 0
+
+
+def init_worker(
+    team: Team,
+    play: int,
+    policy: ThrowPolicy,
+    ball_on_yard: float,
+    event_driven: bool,
+):
+    global worker_simulation, worker_policy, worker_play
+    worker_simulation = Simulation(
+        team,
+        ball_on_yard=ball_on_yard,
+        play_selected=play,
+        verbose=False,
+        event_driven=event_driven,
+    )
+    worker_policy = policy
+    worker_play = play
+
+
+def run_trial(seed: int) -> dict:
+    sim = worker_simulation
+    policy = worker_policy
+    sim.reseed(seed)
+    sim.events.clear()
+    sim.select_play(worker_play)
+    sim.snap()
+    sim.step(policy.throw_after)
+
+    slot, target = policy.target(sim)
+    sim.throw(target, lob=policy.lob)
+    event = sim.run_until(PASS_RESULTS)
+
+    result = {
+        "target": slot,
+        "result": event.name if event else "timeout",
+        "catch_attempt": any(e.name == "catch_attempt" for e in sim.events),
+        "yards": 0.0,
+    }
+    if event is not None and event.name == "catch":
+        los_x = get_yard_x(sim.ball_on_yard)
+        result["yards"] = (event.data["pos"].x - los_x) / YARD_LENGTH
+    return result
+
+
+def summarize(results: list[dict]) -> dict:
+    trials = len(results)
+    completions = [r for r in results if r["result"] == "catch"]
+    attempts = [r for r in results if r["catch_attempt"]]
+    yards = [r["yards"] for r in completions]
+
+    targets = {}
+    for r in results:
+        target = targets.setdefault(r["target"], {"targets": 0, "completions": 0})
+        target["targets"] += 1
+        target["completions"] += r["result"] == "catch"
+
+    return {
+        "trials": trials,
+        "completions": len(completions),
+        "completion_rate": len(completions) / trials if trials else 0.0,
+        "catch_attempts": len(attempts),
+        "catch_attempt_rate": len(attempts) / trials if trials else 0.0,
+        "drops": sum(r["result"] == "drop" for r in results),
+        "incompletions": sum(r["result"] == "incomplete" for r in results),
+        "yards_per_completion": sum(yards) / len(yards) if yards else 0.0,
+        "yards_per_attempt": sum(yards) / trials if trials else 0.0,
+        "max_yards": max(yards) if yards else 0.0,
+        "targets": targets,
+    }
+
+
+def run_trials(
+    team: Team,
+    play: int,
+    policy: ThrowPolicy,
+    n_trials: int,
+    processes: Optional[int] = None,
+    seed: Optional[int] = None,
+    ball_on_yard: float = 20,
+    event_driven: bool = False,
+) -> dict:
+    """Play out n_trials passes over a process pool and aggregate the outcomes"""
+    # Each trial gets its own stream, so results don't depend on the pool size
+    seeds = spawn_seeds(seed, n_trials)
+
+    processes = processes or os.cpu_count() or 1
+    chunksize = max(1, n_trials // (processes * 4))
+    with multiprocessing.Pool(
+        processes,
+        initializer=init_worker,
+        initargs=(team, play, policy, ball_on_yard, event_driven),
+    ) as pool:
+        results = pool.map(run_trial, seeds, chunksize=chunksize)
+
+    return summarize(results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Monte Carlo pass outcomes")
+    parser.add_argument("--team", default="Warforge")
+    parser.add_argument("--play", type=int, default=0, choices=range(len(PLAYS)))
+    parser.add_argument(
+        "--policy",
+        default="deepest",
+        help=f"one of {', '.join(POLICIES)} or a receiver slot ({', '.join(RECEIVER_SLOTS)})",
+    )
+    parser.add_argument("--throw-after", type=int, default=FRAME_RATE)
+    parser.add_argument("--lob", action="store_true")
+    parser.add_argument("--trials", type=int, default=1000)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument(
+        "--event-driven", action="store_true", help="skip uneventful frames"
+    )
+    args = parser.parse_args()
+
+    if args.policy in RECEIVER_SLOTS:
+        policy = ThrowToReceiver(args.policy, args.throw_after, args.lob)
+    else:
+        policy = POLICIES[args.policy](args.throw_after, args.lob)
+
+    team = RosterStore().get(args.team)
+    summary = run_trials(
+        team,
+        args.play,
+        policy,
+        args.trials,
+        args.processes,
+        args.seed,
+        event_driven=args.event_driven,
+    )
+
+    print(
+        f"{summary['trials']} trials [team={team.name} play={args.play} policy={args.policy}]"
+    )
+    print(
+        f"completion_rate={summary['completion_rate']:.3f} "
+        f"catch_attempt_rate={summary['catch_attempt_rate']:.3f} "
+        f"drops={summary['drops']} incompletions={summary['incompletions']}"
+    )
+    print(
+        f"yards_per_completion={summary['yards_per_completion']:.1f} "
+        f"yards_per_attempt={summary['yards_per_attempt']:.1f} "
+        f"max_yards={summary['max_yards']:.1f}"
+    )
+    for slot, target in summary["targets"].items():
+        print(f"  {slot}: {target['completions']}/{target['targets']}")
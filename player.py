@@ -0,0 +1,235 @@
+import math
+from typing import TYPE_CHECKING, Optional
+
+import pygame
+
+from config import DECELERATION_RATE, YARD_LENGTH
+from player_record import PlayerRecord
+from route import EMPTY_ROUTE, Route
+from sprite_atlas import get_player_token
+from team import Team
+
+if TYPE_CHECKING:
+    from player_state import PlayerState
+
+
+class Player(pygame.sprite.Sprite):
+    def __init__(
+        self,
+        team: Team,
+        info={},
+        stats={},
+        record: Optional[PlayerRecord] = None,
+    ):
+        super().__init__()
+        # Set when the player is bound to an array-backed PlayerState
+        self.state: Optional["PlayerState"] = None
+        self.slot = 0
+
+        self.pos = pygame.Vector2(0, 0)
+        self.direction = pygame.Vector2(0, 0)
+        self.velocity = pygame.Vector2(0, 0)
+        # Ratings and the physics constants derived from them
+        self.record = record or PlayerRecord(info, stats)
+        self.max_speed = self.record.max_speed
+        self.acceleration_factor = self.record.acceleration_factor
+        self.momentum_coefficient = self.record.momentum_coefficient
+        self.push_factor = self.record.push_factor
+
+        # Offensive behavior
+        self.route: Route = EMPTY_ROUTE
+        self.route_index = 0
+        self.running_route = False
+        self.reaction_timer = 0
+        self.reaction_target: Optional[pygame.Vector2] = None
+        # Bumped whenever the planned motion changes (new route, collision
+        # impulse), so cached predictions know to refresh
+        self.motion_version = 0
+
+        # Shared with every player in the same colors and number
+        self.image = get_player_token(
+            team.primary_color,
+            team.secondary_color,
+            self.record.jersey_number,
+        )
+        self.rect = self.image.get_rect(center=self.pos)
+
+    def set_pos(self, pos: pygame.Vector2):
+        self.pos = pos
+        self.rect.center = self.pos
+
+    def move(self):
+        if self.direction.length() > 0:
+            desired_velocity = self.direction * self.max_speed
+            offset = desired_velocity - self.velocity
+            self.velocity += offset * self.acceleration_factor
+        else:
+            # Gradually decelerate if no direction is given
+            self.velocity *= DECELERATION_RATE
+
+        # Clamp speed to max_speed
+        if self.velocity.length() > self.max_speed:
+            self.velocity = self.velocity.normalize() * self.max_speed
+
+        # Stop very small velocities (to prevent sliding forever)
+        if self.velocity.length() < 0.1:
+            self.velocity = pygame.Vector2(0, 0)
+
+        self.set_pos(self.pos + self.velocity)
+
+    def stop(self, instant=False):
+        self.direction = pygame.Vector2(0, 0)
+        if instant:
+            self.velocity = pygame.Vector2(0, 0)
+
+    def set_route(self, routes: list[dict]):
+        routes_points = []
+
+        for i, route in enumerate(routes):
+            yards = route.get("yards", 0)
+            angle = route.get("angle", 0)
+
+            if i == 0:
+                dx = yards * YARD_LENGTH * math.cos(math.radians(angle))
+                dy = yards * YARD_LENGTH * math.sin(math.radians(angle))
+                point = pygame.Vector2(self.pos.x + dx, self.pos.y + dy)
+                routes_points.append(point)
+            else:
+                prev_point = routes_points[i - 1]
+                radians = math.radians(angle)
+                dx = yards * YARD_LENGTH * math.cos(radians)
+                dy = yards * YARD_LENGTH * math.sin(radians)
+                point = pygame.Vector2(prev_point.x + dx, prev_point.y + dy)
+                routes_points.append(point)
+
+        self.route = Route(routes_points)
+        self.route_index = 0
+        self.motion_version += 1
+
+    def start_route(self):
+        self.route_index = 0
+        self.running_route = True
+        self.motion_version += 1
+
+    def reset_route(self):
+        self.route = EMPTY_ROUTE
+        self.route_index = 0
+        self.running_route = False
+        self.motion_version += 1
+
+    def reset_reaction(self):
+        self.reaction_timer = 0
+        self.reaction_target = None
+
+    def reset(self):
+        self.stop(True)
+        self.reset_route()
+        self.reset_reaction()
+
+    def reset_to(self, pos: pygame.Vector2):
+        self.reset()
+        self.set_pos(pos)
+
+    def travel_distance(self, frames: int) -> float:
+        """Distance covered in n frames when accelerating towards max_speed"""
+        speed = self.velocity.length()
+        if self.acceleration_factor <= 0:
+            return speed * frames
+
+        # Speed closes a fixed fraction of the gap to max_speed every frame,
+        # so the distance is a geometric series
+        retained = 1 - self.acceleration_factor
+        return (
+            frames * self.max_speed
+            - (self.max_speed - speed)
+            * retained
+            * (1 - retained**frames)
+            / self.acceleration_factor
+        )
+
+    def estimate_position(self, frames: int) -> pygame.Vector2:
+        """Estimate where the player will be after n frames"""
+        if self.running_route:
+            distance = self.travel_distance(frames)
+            return self.route.position_along(self.pos, self.route_index, distance)
+
+        # Not running a route, just keep moving in current direction
+        pos = self.pos.copy()
+        if self.velocity.length() < 0.1:
+            return pos
+        if self.direction.length() == 0:
+            # Coasting to a stop, velocity decays geometrically
+            return pos + self.velocity * (
+                DECELERATION_RATE
+                * (1 - DECELERATION_RATE**frames)
+                / (1 - DECELERATION_RATE)
+            )
+        pos += self.velocity.copy() * frames
+        return pos
+
+    def update_route(self):
+        direction = self.steer(self.pos)
+        if direction is not None:
+            self.direction = direction
+
+    def steer(self, pos: pygame.Vector2) -> Optional[pygame.Vector2]:
+        """Advance the route from pos, returning the new direction if it changed"""
+        # Handle reacting to a throw
+        if self.reaction_timer > 0:
+            self.reaction_timer -= 1
+            if self.reaction_timer == 0 and self.reaction_target is not None:
+                self.reset_route()
+
+                yards = (self.reaction_target - pos).length() / YARD_LENGTH
+                angle = math.degrees(
+                    math.atan2(
+                        self.reaction_target.y - pos.y,
+                        self.reaction_target.x - pos.x,
+                    )
+                )
+
+                self.set_route([{"yards": yards, "angle": angle}])
+                self.start_route()
+                self.reaction_target = None
+
+        if self.running_route and len(self.route) > 0:
+            direction = self.route[self.route_index] - pos
+            distance = direction.length()
+            if distance < self.max_speed:
+                # Reached the route point, go to next or stop
+                if self.route_index + 1 < len(self.route):
+                    self.route_index += 1
+                else:
+                    self.reset_route()
+                    return pygame.Vector2(0, 0)
+            else:
+                return direction.normalize()
+        return None
+
+    def update(self):
+        self.update_route()
+        self.move()
+
+    def __str__(self):
+        record = self.record
+        name = f"{record.first_name} {record.last_name}"
+        number = record.jersey_number
+        overall = record.overall
+        speed = record.speed
+        strength = record.strength
+        agility = record.agility
+        awareness = record.awareness
+        max_speed = self.max_speed
+        return f"{name} (#{number}) [overall={overall} speed={speed} strength={strength} agility={agility} awareness={awareness}]"
+
+    @property
+    def info(self) -> dict:
+        return self.record.info
+
+    @property
+    def stats(self) -> dict:
+        return self.record.stats
+
+    @classmethod
+    def from_roster(cls, team: Team, position: str, index=0):
+        return cls(team, record=team.get_record(position, index))
@@ -0,0 +1,43 @@
+from config import ACCELERATION_RATE, PLAYER_MAX_SPEED
+from roster_format import INFO_DEFAULTS, STAT_DEFAULT, STAT_NAMES
+
+
+class PlayerRecord:
+    """A roster entry compiled into fixed attributes
+
+    Stats are plain attributes instead of dict lookups, and the physics
+    constants derived from them are worked out once.
+    """
+
+    __slots__ = (
+        *INFO_DEFAULTS,
+        *STAT_NAMES,
+        "max_speed",
+        "acceleration_factor",
+        "momentum_coefficient",
+        "push_factor",
+    )
+
+    def __init__(self, info: dict, stats: dict):
+        for name, default in INFO_DEFAULTS.items():
+            setattr(self, name, info.get(name, default))
+        for name in STAT_NAMES:
+            setattr(self, name, stats.get(name, STAT_DEFAULT))
+
+        self.max_speed = PLAYER_MAX_SPEED * (self.speed / 100)
+        self.acceleration_factor = (self.acceleration / 100) * ACCELERATION_RATE
+        # Collision coefficients
+        self.momentum_coefficient = self.weight * self.strength
+        self.push_factor = 1 - self.agility / 400
+
+    @classmethod
+    def from_roster(cls, data: dict) -> "PlayerRecord":
+        return cls(data, data.get("stats", {}))
+
+    @property
+    def info(self) -> dict:
+        return {name: getattr(self, name) for name in INFO_DEFAULTS}
+
+    @property
+    def stats(self) -> dict:
+        return {name: getattr(self, name) for name in STAT_NAMES}
@@ -0,0 +1,122 @@
+import numpy as np
+import pygame
+
+from config import DECELERATION_RATE
+from player import Player
+
+
+class StateVector:
+    """Player vector attribute, stored in the player's PlayerState once bound
+
+    Reads of a bound player hand out a copy, so update in place through the
+    arrays or assign a new vector.
+    """
+
+    def __set_name__(self, owner, name):
+        self.name = name
+        self.private_name = f"_{name}"
+
+    def __get__(self, player, owner=None):
+        if player is None:
+            return self
+        if player.state is None:
+            return getattr(player, self.private_name)
+        x, y = getattr(player.state, self.name)[player.slot]
+        return pygame.Vector2(x, y)
+
+    def __set__(self, player, value):
+        if player.state is None:
+            setattr(player, self.private_name, value)
+        else:
+            getattr(player.state, self.name)[player.slot] = (value[0], value[1])
+
+
+class BoundPlayer(Player):
+    """Player that can have its vectors moved into a PlayerState
+
+    Only players created as this class can be bound, so plain players keep
+    ordinary attributes and don't pay for the descriptors.
+    """
+
+    pos = StateVector()
+    direction = StateVector()
+    velocity = StateVector()
+
+
+class PlayerState:
+    """Struct-of-arrays movement state for a fixed set of players
+
+    Binding a player moves its pos, velocity and direction into rows of
+    contiguous float arrays, so move() can step every player in one
+    vectorized update instead of calling Player.move per player.
+    """
+
+    def __init__(self, players: list):
+        n = len(players)
+        self.players = players
+        self.pos = np.zeros((n, 2))
+        self.velocity = np.zeros((n, 2))
+        self.direction = np.zeros((n, 2))
+        self.max_speed = np.zeros(n)
+        self.acceleration = np.zeros(n)
+        self.momentum_coefficient = np.zeros(n)
+        self.push_factor = np.zeros(n)
+
+        for slot, player in enumerate(players):
+            if not isinstance(player, BoundPlayer):
+                raise TypeError(f"{player} has to be a BoundPlayer to be bound")
+            self.pos[slot] = (player.pos.x, player.pos.y)
+            self.velocity[slot] = (player.velocity.x, player.velocity.y)
+            self.direction[slot] = (player.direction.x, player.direction.y)
+            self.max_speed[slot] = player.max_speed
+            self.acceleration[slot] = player.acceleration_factor
+            self.momentum_coefficient[slot] = player.momentum_coefficient
+            self.push_factor[slot] = player.push_factor
+            player.state = self
+            player.slot = slot
+
+    def update_routes(self):
+        """Player.update_route for every bound player
+
+        Positions are read once and changed directions written back in one
+        go, rather than going through the descriptors player by player.
+        """
+        slots, directions = [], []
+        for slot, (player, pos) in enumerate(zip(self.players, self.pos.tolist())):
+            direction = player.steer(pygame.Vector2(pos))
+            if direction is not None:
+                slots.append(slot)
+                directions.append((direction.x, direction.y))
+        if slots:
+            self.direction[slots] = directions
+
+    def move(self):
+        """Vectorized Player.move for every bound player"""
+        velocity = self.velocity
+        max_speed = self.max_speed
+
+        has_direction = np.any(self.direction != 0, axis=1)
+        desired_velocity = self.direction * max_speed[:, None]
+        accelerated = (
+            velocity + (desired_velocity - velocity) * self.acceleration[:, None]
+        )
+        # Gradually decelerate if no direction is given
+        velocity[:] = np.where(
+            has_direction[:, None], accelerated, velocity * DECELERATION_RATE
+        )
+
+        # Clamp speed to max_speed
+        speed = np.hypot(velocity[:, 0], velocity[:, 1])
+        too_fast = speed > max_speed
+        velocity[too_fast] *= (max_speed[too_fast] / speed[too_fast])[:, None]
+        speed[too_fast] = max_speed[too_fast]
+
+        # Stop very small velocities (to prevent sliding forever)
+        velocity[speed < 0.1] = 0
+
+        self.pos += velocity
+
+    def sync_rects(self):
+        """Move sprite rects to the array positions (only needed for drawing)"""
+        for player, (x, y) in zip(self.players, self.pos):
+            player.rect.center = (x, y)
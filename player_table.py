@@ -0,0 +1,269 @@
+import argparse
+import json
+from pathlib import Path
+from typing import Iterable, Optional
+
+import numpy as np
+
+from roster_format import (
+    INFO_DEFAULTS,
+    POSITION_COUNTS,
+    STAT_DEFAULT,
+    STAT_NAMES,
+    TEAMS_DIR,
+)
+
+# Roster fields stored as columns next to the stats
+INFO_COLUMNS = ["height", "weight", "age", "years_pro", "overall", "jersey_number"]
+COLUMNS = INFO_COLUMNS + STAT_NAMES
+
+
+class PlayerTable:
+    """Every player in a league, one array per column
+
+    Rows are players. Positions and teams are stored as small integer codes
+    into the positions and teams lists, with the rows for each code indexed
+    up front. Columns sorted within a position are built the first time a
+    query needs them and kept for the next one.
+    """
+
+    def __init__(self, teams: Iterable[dict]):
+        self.teams: list[str] = []
+        self.positions: list[str] = list(POSITION_COUNTS)
+        position_lookup = {position: i for i, position in enumerate(self.positions)}
+
+        first_names, last_names = [], []
+        team_codes, position_codes = [], []
+        values = []
+        for team in teams:
+            team_code = len(self.teams)
+            self.teams.append(team.get("name", ""))
+            for player in team.get("players", []):
+                position = player.get("position", "")
+                if position not in position_lookup:
+                    position_lookup[position] = len(self.positions)
+                    self.positions.append(position)
+
+                first_names.append(player.get("first_name", ""))
+                last_names.append(player.get("last_name", ""))
+                team_codes.append(team_code)
+                position_codes.append(position_lookup[position])
+
+                stats = player.get("stats", {})
+                values.append(
+                    [player.get(name, INFO_DEFAULTS[name]) for name in INFO_COLUMNS]
+                    + [stats.get(name, STAT_DEFAULT) for name in STAT_NAMES]
+                )
+
+        self.first_names = np.array(first_names, dtype=str)
+        self.last_names = np.array(last_names, dtype=str)
+        self.team_codes = np.array(team_codes, dtype=np.int32)
+        self.position_codes = np.array(position_codes, dtype=np.int16)
+
+        values = np.array(values, dtype=np.int16).reshape(-1, len(COLUMNS))
+        self.columns: dict[str, np.ndarray] = {
+            name: np.ascontiguousarray(values[:, i]) for i, name in enumerate(COLUMNS)
+        }
+
+        # Rows for each position and team code, in table order
+        self.position_rows = self.group_rows(self.position_codes, len(self.positions))
+        self.team_rows = self.group_rows(self.team_codes, len(self.teams))
+        self.team_lookup = {name: i for i, name in enumerate(self.teams)}
+        self.position_lookup = position_lookup
+
+        # (column, position code or None) to (rows, negated sorted values)
+        self.sorted: dict[tuple[str, Optional[int]], tuple[np.ndarray, np.ndarray]] = {}
+
+    @staticmethod
+    def group_rows(codes: np.ndarray, n_codes: int) -> list[np.ndarray]:
+        order = np.argsort(codes, kind="stable")
+        bounds = np.searchsorted(codes[order], np.arange(n_codes + 1))
+        return [order[bounds[i] : bounds[i + 1]] for i in range(n_codes)]
+
+    @classmethod
+    def load(cls, directory: Path = TEAMS_DIR) -> "PlayerTable":
+        """Table of every team file in a directory, like data/custom_teams"""
+
+        def read_teams():
+            for team_file in sorted(directory.glob("*.json")):
+                with open(team_file, "r") as f:
+                    yield json.load(f)
+
+        return cls(read_teams())
+
+    @classmethod
+    def load_jsonl(cls, path: Path) -> "PlayerTable":
+        """Table of a league written by team_generator.py --format jsonl"""
+
+        def read_teams():
+            with open(path, "r") as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+
+        return cls(read_teams())
+
+    def __len__(self):
+        return len(self.team_codes)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    def get_position_code(self, position: str) -> int:
+        if position not in self.position_lookup:
+            raise KeyError(f"No position {position!r}")
+        return self.position_lookup[position]
+
+    def get_team_code(self, team: str) -> int:
+        if team not in self.team_lookup:
+            raise KeyError(f"No team named {team!r}")
+        return self.team_lookup[team]
+
+    def rows(
+        self, position: Optional[str] = None, team: Optional[str] = None
+    ) -> np.ndarray:
+        """Rows of a position, a team, both or neither, in table order"""
+        if team is not None:
+            rows = self.team_rows[self.get_team_code(team)]
+            if position is not None:
+                rows = rows[
+                    self.position_codes[rows] == self.get_position_code(position)
+                ]
+            return rows
+        if position is not None:
+            return self.position_rows[self.get_position_code(position)]
+        return np.arange(len(self))
+
+    def get_sorted(
+        self, column: str, position: Optional[str] = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Rows ordered by a column, highest first, and the negated values
+
+        Ties keep table order. The values are negated so they ascend, ready
+        for searchsorted.
+        """
+        code = None if position is None else self.get_position_code(position)
+        key = (column, code)
+        cached = self.sorted.get(key)
+        if cached is None:
+            rows = self.rows(position)
+            keys = -self.columns[column][rows]
+            order = np.argsort(keys, kind="stable")
+            cached = (rows[order], keys[order])
+            self.sorted[key] = cached
+        return cached
+
+    def where(
+        self,
+        column: str,
+        minimum: Optional[int] = None,
+        maximum: Optional[int] = None,
+        position: Optional[str] = None,
+        team: Optional[str] = None,
+    ) -> np.ndarray:
+        """Rows with minimum <= column <= maximum, highest first"""
+        if team is not None:
+            rows = self.rows(position, team)
+            values = self.columns[column][rows]
+            mask = np.ones(len(rows), dtype=bool)
+            if minimum is not None:
+                mask &= values >= minimum
+            if maximum is not None:
+                mask &= values <= maximum
+            rows = rows[mask]
+            return rows[np.argsort(-self.columns[column][rows], kind="stable")]
+
+        rows, keys = self.get_sorted(column, position)
+        start = 0 if maximum is None else np.searchsorted(keys, -maximum, "left")
+        end = len(keys) if minimum is None else np.searchsorted(keys, -minimum, "right")
+        return rows[start:end]
+
+    def top(
+        self,
+        column: str,
+        k: int,
+        position: Optional[str] = None,
+        team: Optional[str] = None,
+    ) -> np.ndarray:
+        """Rows of the k highest values of a column"""
+        if team is not None:
+            rows = self.rows(position, team)
+            return rows[np.argsort(-self.columns[column][rows], kind="stable")[:k]]
+        return self.get_sorted(column, position)[0][:k]
+
+    def aggregate_by_position(self, column: str) -> dict[str, dict]:
+        """count, mean, min and max of a column for each position"""
+        values = self.columns[column]
+        counts = np.bincount(self.position_codes, minlength=len(self.positions))
+        sums = np.bincount(
+            self.position_codes, weights=values, minlength=len(self.positions)
+        )
+
+        summary = {}
+        for code, position in enumerate(self.positions):
+            if counts[code] == 0:
+                continue
+            position_values = values[self.position_rows[code]]
+            summary[position] = {
+                "count": int(counts[code]),
+                "mean": float(sums[code] / counts[code]),
+                "min": int(position_values.min()),
+                "max": int(position_values.max()),
+            }
+        return summary
+
+    def get_player(self, row: int) -> dict:
+        """A row as a roster-style dict, with the team name added"""
+        player = {
+            "first_name": str(self.first_names[row]),
+            "last_name": str(self.last_names[row]),
+            "team": self.teams[self.team_codes[row]],
+            "position": self.positions[self.position_codes[row]],
+        }
+        player.update({name: int(self.columns[name][row]) for name in INFO_COLUMNS})
+        player["stats"] = {name: int(self.columns[name][row]) for name in STAT_NAMES}
+        return player
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query players across a league")
+    parser.add_argument("column", choices=COLUMNS)
+    parser.add_argument("--position", default=None)
+    parser.add_argument("--team", default=None)
+    parser.add_argument("--min", type=int, default=None)
+    parser.add_argument("--max", type=int, default=None)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument(
+        "--league",
+        type=Path,
+        default=TEAMS_DIR,
+        help="directory of team files or a jsonl league (default data/custom_teams)",
+    )
+    parser.add_argument(
+        "--by-position",
+        action="store_true",
+        help="print the column's count, mean, min and max for each position",
+    )
+    args = parser.parse_args()
+
+    if args.league.is_dir():
+        table = PlayerTable.load(args.league)
+    else:
+        table = PlayerTable.load_jsonl(args.league)
+    print(f"{len(table)} players on {len(table.teams)} teams")
+
+    if args.by_position:
+        for position, stats in table.aggregate_by_position(args.column).items():
+            print(
+                f"  {position:<3} count={stats['count']} mean={stats['mean']:.1f} "
+                f"min={stats['min']} max={stats['max']}"
+            )
+    else:
+        rows = table.where(args.column, args.min, args.max, args.position, args.team)
+        print(f"{len(rows)} matches")
+        for row in rows[: args.top]:
+            player = table.get_player(row)
+            print(
+                f"  {player['position']:<3} {player['first_name']} {player['last_name']} "
+                f"({player['team']}) {args.column}={table[args.column][row]}"
+            )
@@ -0,0 +1,158 @@
+import csv
+import json
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Optional
+
+import pygame
+
+from colors import get_color
+from config import FRAME_RATE
+from fonts import get_font
+
+# Per-frame budget at the target frame rate, in milliseconds
+FRAME_BUDGET_MS = 1000 / FRAME_RATE
+
+
+class NullProfiler:
+    """Stand-in used when timing is off, sections cost a no-op context"""
+
+    enabled = False
+
+    def section(self, name: str):
+        return nullcontext()
+
+    def end_frame(self):
+        pass
+
+
+class FrameProfiler:
+    """Times named stages of each frame
+
+    Keeps a rolling window per stage for percentiles and a bounded log of
+    per-frame timings for export.
+    """
+
+    enabled = True
+
+    def __init__(
+        self, window: int = FRAME_RATE * 5, max_frames: int = FRAME_RATE * 600
+    ):
+        self.window = window
+        self.stages: list[str] = []
+        self.current: dict[str, float] = {}
+        self.history: dict[str, deque] = {}
+        self.frames: deque = deque(maxlen=max_frames)
+        self.frame = 0
+
+    @contextmanager
+    def section(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            self.current[name] = self.current.get(name, 0.0) + elapsed
+
+    def end_frame(self):
+        # Time spent in the stages, leaving out the wait for the next tick
+        self.current["total"] = sum(self.current.values())
+
+        for name, elapsed in self.current.items():
+            if name not in self.history:
+                self.stages.append(name)
+                self.history[name] = deque(maxlen=self.window)
+            self.history[name].append(elapsed)
+
+        self.frames.append((self.frame, self.current))
+        self.current = {}
+        self.frame += 1
+
+    def percentile(self, name: str, q: float) -> float:
+        values = sorted(self.history.get(name, ()))
+        if not values:
+            return 0.0
+        index = min(len(values) - 1, int(q / 100 * len(values)))
+        return values[index]
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        return {
+            name: {"p50": self.percentile(name, 50), "p99": self.percentile(name, 99)}
+            for name in self.stages
+        }
+
+    def export_csv(self, path: Path):
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame", *self.stages])
+            for frame, timings in self.frames:
+                writer.writerow(
+                    [frame, *(timings.get(name, 0.0) for name in self.stages)]
+                )
+
+    def export_json(self, path: Path):
+        data = {
+            "stages": self.stages,
+            "summary": self.summary(),
+            "frames": [{"frame": frame, **timings} for frame, timings in self.frames],
+        }
+        with open(path, "w") as f:
+            json.dump(data, f)
+
+    def export(self, path: Path):
+        """Write timings as CSV or JSON depending on the file suffix"""
+        path = Path(path)
+        if path.suffix == ".json":
+            self.export_json(path)
+        else:
+            self.export_csv(path)
+
+
+class ProfilerOverlay:
+    """Rolling p50/p99 per stage, drawn over the top-left of the screen"""
+
+    def __init__(self, profiler: FrameProfiler, refresh_frames: int = FRAME_RATE // 4):
+        self.profiler = profiler
+        self.visible = False
+        self.refresh_frames = refresh_frames
+        self.font = get_font(None, 18)
+        self.lines: list[pygame.Surface] = []
+        self.frames_since_refresh = refresh_frames
+
+    def toggle(self):
+        self.visible = not self.visible
+        self.frames_since_refresh = self.refresh_frames
+
+    def refresh(self):
+        self.lines = [self.font.render("stage  p50 / p99 ms", True, get_color("white"))]
+        for name, stats in self.profiler.summary().items():
+            over_budget = stats["p99"] > FRAME_BUDGET_MS
+            color = get_color("red", 400) if over_budget else get_color("white")
+            text = f"{name}  {stats['p50']:.2f} / {stats['p99']:.2f}"
+            self.lines.append(self.font.render(text, True, color))
+
+    def draw(self, surface: pygame.Surface) -> Optional[pygame.Rect]:
+        """Draw the overlay if visible and return the area it covers"""
+        if not self.visible:
+            return None
+
+        # Re-render the text a few times a second rather than every frame
+        self.frames_since_refresh += 1
+        if self.frames_since_refresh >= self.refresh_frames:
+            self.refresh()
+            self.frames_since_refresh = 0
+
+        width = max(line.get_width() for line in self.lines) + 8
+        height = sum(line.get_height() for line in self.lines) + 8
+        background = pygame.Surface((width, height), pygame.SRCALPHA)
+        background.fill((0, 0, 0, 160))
+        rect = surface.blit(background, (4, 4))
+
+        y = 8
+        for line in self.lines:
+            surface.blit(line, (8, y))
+            y += line.get_height()
+
+        return rect
@@ -0,0 +1,360 @@
+from typing import Optional
+
+import pygame
+
+from camera import Camera, FieldTiles
+from colors import get_color
+from config import (
+    CATCH_RADIUS,
+    DEBUG_OVERLAYS,
+    DIRTY_RECT_RENDERING,
+    FIELD_HEIGHT,
+    PLAYER_RADIUS,
+)
+from field import Field
+from profiler import FrameProfiler, NullProfiler
+from simulation import Simulation
+from utils import get_yard_x
+
+# Transparent color of the overlay layer, nothing is drawn in pure black
+OVERLAY_COLORKEY = (0, 0, 0)
+
+
+class Renderer:
+    def __init__(
+        self,
+        simulation: Simulation,
+        profiler: Optional[FrameProfiler] = None,
+        dirty_rects: bool = DIRTY_RECT_RENDERING,
+        camera: Optional[Camera] = None,
+        debug_overlays: bool = DEBUG_OVERLAYS,
+    ):
+        self.simulation = simulation
+        self.profiler = profiler or NullProfiler()
+        self.field = Field()
+
+        # Only redraw what changed, restoring from a cached background
+        self.dirty_rects = dirty_rects
+        self.background: Optional[pygame.Surface] = None
+        self.background_key = None
+        # Areas drawn over last frame, restored from the background next frame
+        self.drawn: list[pygame.Rect] = []
+
+        # Draw through a panning, zooming camera. Everything moves when the
+        # camera does, so this always redraws the whole screen.
+        self.camera = camera
+
+        # Routes, catch radii and the landing marker
+        self.debug_overlays = debug_overlays
+        # Route lines and the landing marker, redrawn only when they change
+        self.overlay_layer: Optional[pygame.Surface] = None
+        self.overlay_key = None
+        self.overlay_rect: Optional[pygame.Rect] = None
+        self.field_tiles: Optional[FieldTiles] = None
+        # Sprite images scaled to each zoom level, keyed by (image, zoom)
+        self.scaled_images: dict[tuple[pygame.Surface, float], pygame.Surface] = {}
+        if camera is not None:
+            self.field_tiles = FieldTiles(self.field, camera.zoom_levels)
+
+    def draw(self, screen: pygame.Surface) -> list[pygame.Rect]:
+        """Draw the frame and return the areas of the screen that changed"""
+        if self.camera is not None:
+            return self.draw_camera(screen)
+
+        profiler = self.profiler
+        with profiler.section("draw_field"):
+            if self.dirty_rects:
+                restored = self.restore_background(screen)
+            else:
+                self.draw_field(screen)
+                restored = [screen.get_rect()]
+
+        drawn = []
+        with profiler.section("draw_players"):
+            drawn += self.draw_players(screen)
+        with profiler.section("draw_ball"):
+            drawn += self.draw_ball(screen)
+        if self.debug_overlays:
+            with profiler.section("draw_overlays"):
+                drawn += self.draw_overlays(screen)
+
+        self.drawn = drawn
+        return restored + drawn
+
+    def mark_dirty(self, rect: pygame.Rect):
+        """Have an area drawn over outside the renderer restored next frame"""
+        self.drawn.append(rect)
+
+    def restore_background(self, screen: pygame.Surface) -> list[pygame.Rect]:
+        sim = self.simulation
+        key = (sim.ball_on_yard, sim.yards_to_go, screen.get_size())
+        if self.background is None or key != self.background_key:
+            # Field or lines moved, start over from a full redraw
+            self.background = pygame.Surface(screen.get_size(), 0, screen)
+            self.draw_field(self.background)
+            self.background_key = key
+            screen.blit(self.background, (0, 0))
+            return [screen.get_rect()]
+
+        for rect in self.drawn:
+            screen.blit(self.background, rect, rect)
+        return self.drawn
+
+    def draw_field(self, screen: pygame.Surface):
+        sim = self.simulation
+
+        screen.fill((0, 0, 0))
+
+        screen.blit(self.field.image, self.field.rect)
+
+        # Draw line of scrimmage
+
+        los_x = get_yard_x(sim.ball_on_yard)
+        pygame.draw.line(
+            screen, get_color("blue", 600), (los_x, 0), (los_x, FIELD_HEIGHT), 2
+        )
+
+        # Draw first down line
+        fd_x = get_yard_x(sim.ball_on_yard + sim.yards_to_go)
+        pygame.draw.line(
+            screen, get_color("yellow", 400), (fd_x, 0), (fd_x, FIELD_HEIGHT), 2
+        )
+
+    def draw_players(self, screen: pygame.Surface) -> list[pygame.Rect]:
+        sim = self.simulation
+        sim.sync_sprites()
+
+        # for player in sim.all_players:
+        #     # Draw estimated position after 60 frames
+        #     future_pos = player.estimate_position(
+        #         sim.ball.frames_left if sim.ball.frames_left > 0 else 60
+        #     )
+        #     pygame.draw.circle(
+        #         screen,
+        #         get_color("red"),
+        #         (future_pos.x, future_pos.y),
+        #         2,
+        #         2,
+        #     )
+
+        return screen.blits([(player.image, player.rect) for player in sim.all_players])
+
+    def draw_ball(self, screen: pygame.Surface) -> list[pygame.Rect]:
+        sim = self.simulation
+        drawn = []
+
+        # Draw ball and halo
+
+        drawn.append(screen.blit(sim.ball.image, sim.ball.rect))
+        drawn.append(screen.blit(sim.halo.image, sim.halo.rect))
+
+        return drawn
+
+    def get_overlay_key(self) -> tuple:
+        """Changes whenever the cached overlay layer needs redrawing"""
+        sim = self.simulation
+        # set_route and reset_route swap in a new Route object
+        routes = tuple(
+            (receiver.route, receiver.route_index) for receiver in sim.receivers
+        )
+        landing_at = None
+        if sim.ball_carrier is None and sim.ball.frames_left > 0:
+            landing_at = tuple(sim.ball.landing_at)
+        return routes, landing_at
+
+    def update_overlay_layer(self, screen: pygame.Surface):
+        """Redraw the parts of the overlays that only change with the routes"""
+        key = self.get_overlay_key()
+        if key == self.overlay_key:
+            return
+        self.overlay_key = key
+
+        sim = self.simulation
+        lines = []
+        # Routes past the point each receiver is heading for
+        for receiver in sim.receivers:
+            route = receiver.route
+            for i in range(receiver.route_index + 1, len(route)):
+                lines.append((route[i - 1], route[i]))
+        landing_at = None
+        if sim.ball_carrier is None and sim.ball.frames_left > 0:
+            landing_at = sim.ball.landing_at
+
+        # Size the layer to what's on it, it's refilled on every change
+        bounds = [
+            pygame.Rect(start, (0, 0)).union(pygame.Rect(end, (0, 0)))
+            for start, end in lines
+        ]
+        if landing_at is not None:
+            bounds.append(pygame.Rect(0, 0, PLAYER_RADIUS * 2, PLAYER_RADIUS * 2))
+            bounds[-1].center = landing_at
+        if not bounds:
+            self.overlay_layer = None
+            self.overlay_rect = None
+            return
+        rect = bounds[0].unionall(bounds[1:]).inflate(4, 4)
+        offset = pygame.Vector2(rect.topleft)
+
+        layer = pygame.Surface(rect.size, 0, screen)
+        layer.fill(OVERLAY_COLORKEY)
+        for start, end in lines:
+            pygame.draw.line(
+                layer, get_color("yellow", 400), start - offset, end - offset, 1
+            )
+
+        # Draw ball landing position
+        if landing_at is not None:
+            pygame.draw.circle(
+                layer,
+                get_color("white"),
+                landing_at - offset,
+                PLAYER_RADIUS,
+                1,
+            )
+
+        # Mostly empty, so a run-length encoded colorkey blits fastest
+        layer.set_colorkey(OVERLAY_COLORKEY, pygame.RLEACCEL)
+        self.overlay_layer = layer
+        self.overlay_rect = rect
+
+    def draw_overlays(self, screen: pygame.Surface) -> list[pygame.Rect]:
+        sim = self.simulation
+        drawn = []
+
+        self.update_overlay_layer(screen)
+        if self.overlay_layer is not None:
+            drawn.append(screen.blit(self.overlay_layer, self.overlay_rect))
+
+        for receiver in sim.receivers:
+            # Draw catch radius around receivers
+            catch_rect = pygame.Rect(
+                receiver.pos.x - CATCH_RADIUS,
+                receiver.pos.y - CATCH_RADIUS,
+                CATCH_RADIUS * 2,
+                CATCH_RADIUS * 2,
+            )
+
+            drawn.append(pygame.draw.rect(screen, get_color("white"), catch_rect, 1))
+
+            # Only the leg being run moves with the receiver
+            if receiver.route_index < len(receiver.route):
+                drawn.append(
+                    pygame.draw.line(
+                        screen,
+                        get_color("yellow", 400),
+                        receiver.pos,
+                        receiver.route[receiver.route_index],
+                        1,
+                    )
+                )
+
+        return drawn
+
+    def screen_to_world(self, pos) -> pygame.Vector2:
+        """Field position under a point on the screen, e.g. the mouse"""
+        if self.camera is None:
+            return pygame.Vector2(pos)
+        return self.camera.screen_to_world(pos)
+
+    def get_scaled_image(self, image: pygame.Surface) -> pygame.Surface:
+        zoom = self.camera.zoom
+        if zoom == 1:
+            return image
+        key = (image, zoom)
+        scaled = self.scaled_images.get(key)
+        if scaled is None:
+            size = (round(image.get_width() * zoom), round(image.get_height() * zoom))
+            scaled = pygame.transform.smoothscale(image, size)
+            self.scaled_images[key] = scaled
+        return scaled
+
+    def draw_sprite(self, screen: pygame.Surface, image: pygame.Surface, pos):
+        """Blit a sprite centered on a field position, if it's in view"""
+        camera = self.camera
+        world_rect = image.get_rect(center=pos)
+        if not camera.view_rect.colliderect(world_rect):
+            return
+        scaled = self.get_scaled_image(image)
+        screen.blit(scaled, scaled.get_rect(center=camera.world_to_screen(pos)))
+
+    def draw_world_line(self, screen: pygame.Surface, color, start, end, width=1):
+        """Line between field positions, clipped to the view"""
+        camera = self.camera
+        clipped = camera.view_rect.clipline(start, end)
+        if not clipped:
+            return
+        start, end = clipped
+        pygame.draw.line(
+            screen,
+            color,
+            camera.world_to_screen(pygame.Vector2(start)),
+            camera.world_to_screen(pygame.Vector2(end)),
+            max(1, round(width * camera.zoom)),
+        )
+
+    def draw_camera(self, screen: pygame.Surface) -> list[pygame.Rect]:
+        sim = self.simulation
+        camera = self.camera
+        profiler = self.profiler
+        camera.follow(sim.ball.pos)
+        view = camera.view_rect
+
+        with profiler.section("draw_field"):
+            screen.fill((0, 0, 0))
+            self.field_tiles.draw(screen, camera)
+
+            los_x = get_yard_x(sim.ball_on_yard)
+            self.draw_world_line(
+                screen, get_color("blue", 600), (los_x, 0), (los_x, FIELD_HEIGHT), 2
+            )
+            fd_x = get_yard_x(sim.ball_on_yard + sim.yards_to_go)
+            self.draw_world_line(
+                screen, get_color("yellow", 400), (fd_x, 0), (fd_x, FIELD_HEIGHT), 2
+            )
+
+        with profiler.section("draw_players"):
+            for player in sim.all_players:
+                self.draw_sprite(screen, player.image, player.pos)
+
+        with profiler.section("draw_ball"):
+            self.draw_sprite(screen, sim.ball.image, sim.ball.pos)
+            self.draw_sprite(screen, sim.halo.image, sim.halo.pos)
+
+        if not self.debug_overlays:
+            return [screen.get_rect()]
+
+        with profiler.section("draw_overlays"):
+            if sim.ball_carrier is None and sim.ball.frames_left > 0:
+                landing_at = sim.ball.landing_at
+                if view.collidepoint(landing_at):
+                    pygame.draw.circle(
+                        screen,
+                        get_color("white"),
+                        camera.world_to_screen(landing_at),
+                        PLAYER_RADIUS * camera.zoom,
+                        1,
+                    )
+
+            for receiver in sim.receivers:
+                catch_rect = pygame.Rect(
+                    receiver.pos.x - CATCH_RADIUS,
+                    receiver.pos.y - CATCH_RADIUS,
+                    CATCH_RADIUS * 2,
+                    CATCH_RADIUS * 2,
+                )
+                if view.colliderect(catch_rect):
+                    pygame.draw.rect(
+                        screen, get_color("white"), camera.rect_to_screen(catch_rect), 1
+                    )
+
+                for i in range(receiver.route_index, len(receiver.route)):
+                    start_pos = (
+                        receiver.pos
+                        if i == receiver.route_index
+                        else receiver.route[i - 1]
+                    )
+                    self.draw_world_line(
+                        screen, get_color("yellow", 400), start_pos, receiver.route[i]
+                    )
+
+        return [screen.get_rect()]
@@ -0,0 +1,338 @@
+import argparse
+import json
+import os
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+import numpy as np
+import pygame
+
+from config import FRAME_RATE
+from simulation import PLAYS, Simulation
+
+MAGIC = b"PFREPLAY"
+VERSION = 1
+# Records start on a multiple of this many bytes
+ALIGNMENT = 8
+
+# Each recorded frame flags the events emitted since the previous record,
+# one bit per name in this list
+EVENT_NAMES = ["reset", "snap", "throw", "catch_attempt", "catch", "drop", "incomplete"]
+EVENT_BITS = {name: 1 << i for i, name in enumerate(EVENT_NAMES)}
+# Events indexed by ReplayReader for seeking, "reset" marks play boundaries
+KEYFRAME_EVENTS = ["reset", "snap", "throw", "catch"]
+
+# Storage type and scale for positions, velocities and ball height. int16
+# keeps 1/16 px steps over the whole field (1280 * 16 < 2**15).
+PRECISIONS = {
+    "float32": ("<f4", 1),
+    "float16": ("<f2", 1),
+    "int16": ("<i2", 16),
+}
+
+
+def record_dtype(n_players: int, precision: str) -> np.dtype:
+    """Fixed-width layout of one frame"""
+    value, _ = PRECISIONS[precision]
+    return np.dtype(
+        [
+            ("frame", "<u4"),
+            ("events", "<u2"),
+            ("play", "u1"),
+            # Index into the header's slots, -1 while the ball is loose
+            ("carrier", "i1"),
+            ("ball_z", value),
+            ("ball_pos", value, (2,)),
+            ("pos", value, (n_players, 2)),
+            ("velocity", value, (n_players, 2)),
+        ]
+    )
+
+
+def encode_events(events: list) -> int:
+    bits = 0
+    for event in events:
+        bits |= EVENT_BITS.get(event.name, 0)
+    return bits
+
+
+def decode_events(bits: int) -> list[str]:
+    return [name for name in EVENT_NAMES if bits & EVENT_BITS[name]]
+
+
+class ReplayRecorder:
+    """Streams per-frame simulation state to a binary replay file
+
+    Frames are collected in a fixed-size buffer that is written out when it
+    fills up, so memory use doesn't grow with the length of the session.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        simulation: Simulation,
+        precision: str = "float32",
+        buffer_frames: int = FRAME_RATE * 10,
+    ):
+        self.simulation = simulation
+        self.slots = list(simulation.formation())
+        self.players = [getattr(simulation, slot) for slot in self.slots]
+        self.precision = precision
+        _, self.scale = PRECISIONS[precision]
+        self.dtype = record_dtype(len(self.slots), precision)
+        self.quantized = self.dtype["ball_z"].kind == "i"
+
+        self.buffer = np.zeros(buffer_frames, dtype=self.dtype)
+        self.buffered = 0
+        self.recorded = 0
+        # Events in simulation.events already folded into a record
+        self.events_seen = len(simulation.events)
+
+        self.file: BinaryIO = open(path, "wb")
+        self.write_header()
+
+    def write_header(self):
+        header = {
+            "version": VERSION,
+            "team": self.simulation.offense_team.name,
+            "slots": self.slots,
+            "events": EVENT_NAMES,
+            "precision": self.precision,
+            "scale": self.scale,
+            "frame_rate": FRAME_RATE,
+        }
+        data = json.dumps(header).encode()
+        start = len(MAGIC) + 4
+        padding = -(start + len(data)) % ALIGNMENT
+        data += b" " * padding
+
+        self.file.write(MAGIC)
+        self.file.write(np.uint32(len(data)).tobytes())
+        self.file.write(data)
+
+    def encode(self, values) -> np.ndarray:
+        values = np.asarray(values, dtype=np.float64) * self.scale
+        if self.quantized:
+            values = np.round(values)
+        return values
+
+    def record(self):
+        """Capture the simulation as it is now"""
+        sim = self.simulation
+        if len(sim.events) < self.events_seen:
+            # The event log was cleared, e.g. between Monte Carlo trials
+            self.events_seen = 0
+        new_events = sim.events[self.events_seen :]
+        self.events_seen = len(sim.events)
+
+        row = self.buffer[self.buffered]
+        row["frame"] = sim.frame
+        row["events"] = encode_events(new_events)
+        row["play"] = sim.play_selected
+        row["carrier"] = (
+            self.players.index(sim.ball_carrier) if sim.ball_carrier else -1
+        )
+        row["ball_z"] = self.encode(sim.ball.z)
+        row["ball_pos"] = self.encode(sim.ball.pos)
+        row["pos"] = self.encode([player.pos for player in self.players])
+        row["velocity"] = self.encode([player.velocity for player in self.players])
+
+        self.buffered += 1
+        self.recorded += 1
+        if self.buffered == len(self.buffer):
+            self.flush()
+
+    def flush(self):
+        self.file.write(self.buffer[: self.buffered].tobytes())
+        self.file.flush()
+        self.buffered = 0
+
+    def close(self):
+        if self.file.closed:
+            return
+        self.flush()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_header(f: BinaryIO) -> tuple[dict, int]:
+    """Header dict and the byte offset of the first record"""
+    if f.read(len(MAGIC)) != MAGIC:
+        raise ValueError("Not a replay file")
+    size = int(np.frombuffer(f.read(4), dtype="<u4")[0])
+    header = json.loads(f.read(size))
+    if header["version"] != VERSION:
+        raise ValueError(f"Unsupported replay version {header['version']}")
+    return header, len(MAGIC) + 4 + size
+
+
+class ReplayReader:
+    """Random access into a replay file without reading it into memory
+
+    Records are memory-mapped, so only the pages that are looked at get
+    loaded. A keyframe index of play boundaries, snaps, throws and catches is
+    built once and saved next to the replay.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self.header, offset = read_header(f)
+        self.slots = self.header["slots"]
+        self.scale = self.header["scale"]
+        self.dtype = record_dtype(len(self.slots), self.header["precision"])
+
+        # A recorder that was cut off can leave a partial last record
+        n_records = (self.path.stat().st_size - offset) // self.dtype.itemsize
+        self.records = np.memmap(
+            self.path, dtype=self.dtype, mode="r", offset=offset, shape=(n_records,)
+        )
+
+        # Recorded frames are normally consecutive, which makes finding a
+        # frame a subtraction rather than a search
+        self.first_frame = int(self.records[0]["frame"]) if n_records else 0
+        last_frame = int(self.records[-1]["frame"]) if n_records else -1
+        self.contiguous = last_frame - self.first_frame == n_records - 1
+
+        self.keyframes = self.load_keyframes()
+
+    def __len__(self):
+        return len(self.records)
+
+    @property
+    def index_path(self) -> Path:
+        return self.path.with_name(self.path.name + ".idx.npz")
+
+    def load_keyframes(self) -> dict[str, np.ndarray]:
+        index_path = self.index_path
+        if (
+            index_path.exists()
+            and index_path.stat().st_mtime >= self.path.stat().st_mtime
+        ):
+            with np.load(index_path) as index:
+                if int(index["n_records"]) == len(self):
+                    return {name: index[name] for name in KEYFRAME_EVENTS}
+
+        keyframes = self.build_keyframes()
+        try:
+            np.savez(index_path, n_records=len(self), **keyframes)
+        except OSError:
+            # Read-only archives still work, the index is just rebuilt
+            pass
+        return keyframes
+
+    def build_keyframes(self, chunk: int = 1 << 20) -> dict[str, np.ndarray]:
+        """Record indices of each keyframe event, scanned a chunk at a time"""
+        found = {name: [] for name in KEYFRAME_EVENTS}
+        for start in range(0, len(self), chunk):
+            events = np.asarray(self.records["events"][start : start + chunk])
+            flagged = np.nonzero(events)[0]
+            for name in KEYFRAME_EVENTS:
+                hits = flagged[(events[flagged] & EVENT_BITS[name]) != 0]
+                found[name].append(hits + start)
+        return {
+            name: np.concatenate(hits) if hits else np.zeros(0, dtype=np.intp)
+            for name, hits in found.items()
+        }
+
+    def index_of(self, frame: int) -> int:
+        """Record index holding `frame`, or the last one before it"""
+        if self.contiguous:
+            index = frame - self.first_frame
+        else:
+            index = int(np.searchsorted(self.records["frame"], frame, "right")) - 1
+        return min(max(index, 0), len(self) - 1)
+
+    def next_keyframe(self, index: int, name: str = "reset") -> Optional[int]:
+        keyframes = self.keyframes[name]
+        i = np.searchsorted(keyframes, index, "right")
+        return int(keyframes[i]) if i < len(keyframes) else None
+
+    def previous_keyframe(self, index: int, name: str = "reset") -> Optional[int]:
+        keyframes = self.keyframes[name]
+        i = np.searchsorted(keyframes, index, "left")
+        return int(keyframes[i - 1]) if i > 0 else None
+
+    def events_at(self, index: int) -> list[str]:
+        return decode_events(int(self.records[index]["events"]))
+
+    def apply(self, index: int, simulation: Simulation):
+        """Pose the simulation's sprites as they were in record `index`"""
+        record = self.records[index]
+        if simulation.play_selected != record["play"]:
+            # Lays out the play's routes, so do it before placing players
+            simulation.select_play(int(record["play"]))
+
+        pos = record["pos"].astype(np.float64) / self.scale
+        velocity = record["velocity"].astype(np.float64) / self.scale
+        for slot, p, v in zip(self.slots, pos, velocity):
+            player = getattr(simulation, slot)
+            player.set_pos(pygame.Vector2(p[0], p[1]))
+            player.velocity = pygame.Vector2(v[0], v[1])
+
+        ball_pos = record["ball_pos"].astype(np.float64) / self.scale
+        simulation.ball.set_pos(pygame.Vector2(ball_pos[0], ball_pos[1]))
+        simulation.ball.z = float(record["ball_z"]) / self.scale
+        simulation.halo.set_pos(simulation.ball.pos.copy())
+
+        carrier = int(record["carrier"])
+        simulation.ball_carrier = (
+            getattr(simulation, self.slots[carrier]) if carrier >= 0 else None
+        )
+        simulation.frame = int(record["frame"])
+
+    def close(self):
+        # np.memmap has no close(), dropping the reference unmaps the file
+        self.records = None
+
+
+if __name__ == "__main__":
+    from monte_carlo import PASS_RESULTS, ThrowToDeepest
+    from team import RosterStore
+
+    parser = argparse.ArgumentParser(description="Record simulated plays")
+    parser.add_argument("output", type=Path)
+    parser.add_argument("--team", default="Warforge")
+    parser.add_argument("--plays", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--precision", default="float32", choices=PRECISIONS)
+    parser.add_argument(
+        "--after-play",
+        type=int,
+        default=FRAME_RATE,
+        help="frames recorded after each pass result",
+    )
+    args = parser.parse_args()
+
+    sim = Simulation(RosterStore().get(args.team), verbose=False, seed=args.seed)
+    policy = ThrowToDeepest()
+
+    def record_frames(recorder: ReplayRecorder, n_frames: int) -> Optional[str]:
+        for _ in range(n_frames):
+            first_event = len(sim.events)
+            sim.update()
+            recorder.record()
+            for event in sim.events[first_event:]:
+                if event.name in PASS_RESULTS:
+                    return event.name
+        return None
+
+    with ReplayRecorder(args.output, sim, args.precision) as recorder:
+        for i in range(args.plays):
+            # The reset and snap are flagged on the first frame after the snap,
+            # which keeps recorded frame numbers consecutive
+            sim.select_play(i % len(PLAYS))
+            sim.snap()
+            record_frames(recorder, policy.throw_after)
+            _, target = policy.target(sim)
+            sim.throw(target, lob=policy.lob)
+            record_frames(recorder, FRAME_RATE * 10)
+            record_frames(recorder, args.after_play)
+
+    size = args.output.stat().st_size
+    print(f"Recorded {recorder.recorded} frames to {args.output} ({size} bytes)")
@@ -0,0 +1,90 @@
+import argparse
+import sys
+from pathlib import Path
+
+import pygame
+
+from config import DIRTY_RECT_RENDERING, FRAME_RATE, HEIGHT, WIDTH
+from renderer import Renderer
+from replay import ReplayReader
+from simulation import Simulation
+from team import RosterStore
+
+parser = argparse.ArgumentParser(description="Play back a recorded replay")
+parser.add_argument("replay", type=Path)
+args = parser.parse_args()
+
+reader = ReplayReader(args.replay)
+if len(reader) == 0:
+    sys.exit(f"{args.replay} has no recorded frames")
+
+pygame.init()
+screen = pygame.display.set_mode((WIDTH, HEIGHT))
+pygame.display.set_caption(f"2D Football - {args.replay.name}")
+clock = pygame.time.Clock()
+
+simulation = Simulation(RosterStore().get(reader.header["team"]), verbose=False)
+# Replays only record positions, not the routes, reactions and ball flight
+# the overlays are drawn from
+renderer = Renderer(simulation, debug_overlays=False)
+
+index = 0
+playing = True
+
+
+def seek(target):
+    global index
+    if target is not None:
+        index = min(max(target, 0), len(reader) - 1)
+
+
+while True:
+    #########
+    # EVENT #
+    #########
+
+    for event in pygame.event.get():
+        if event.type == pygame.QUIT:
+            pygame.quit()
+            sys.exit()
+
+        if event.type == pygame.KEYDOWN:
+            step = FRAME_RATE if event.mod & pygame.KMOD_SHIFT else 1
+            if event.key == pygame.K_SPACE:
+                playing = not playing
+            if event.key == pygame.K_RIGHT:
+                seek(index + step)
+            if event.key == pygame.K_LEFT:
+                seek(index - step)
+            if event.key == pygame.K_DOWN:
+                # Next play
+                seek(reader.next_keyframe(index, "reset"))
+            if event.key == pygame.K_UP:
+                # Start of this play, or the previous one when already there
+                seek(reader.previous_keyframe(index, "reset"))
+            if event.key == pygame.K_s:
+                seek(reader.next_keyframe(index, "snap"))
+            if event.key == pygame.K_t:
+                seek(reader.next_keyframe(index, "throw"))
+            if event.key == pygame.K_c:
+                seek(reader.next_keyframe(index, "catch"))
+
+    ##########
+    # UPDATE #
+    ##########
+
+    reader.apply(index, simulation)
+    if playing and index < len(reader) - 1:
+        index += 1
+
+    ########
+    # DRAW #
+    ########
+
+    dirty = renderer.draw(screen)
+
+    if DIRTY_RECT_RENDERING:
+        pygame.display.update(dirty)
+    else:
+        pygame.display.flip()
+    clock.tick(FRAME_RATE)
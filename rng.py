@@ -0,0 +1,22 @@
+import random
+from typing import Optional
+
+import numpy as np
+
+
+def spawn_seeds(seed: Optional[int], n: int) -> list[int]:
+    """Derive n independent child seeds from seed
+
+    Uses numpy's SeedSequence so the streams don't overlap, and the i-th
+    child is the same no matter how many are spawned or which process uses
+    it. A seed of None draws fresh entropy from the OS.
+    """
+    children = np.random.SeedSequence(seed).spawn(n)
+    return [
+        int.from_bytes(child.generate_state(4).tobytes(), "little")
+        for child in children
+    ]
+
+
+def make_rng(seed: Optional[int] = None) -> random.Random:
+    return random.Random(seed)
@@ -0,0 +1,72 @@
+from pathlib import Path
+
+# Where team_generator.py writes team files and the game reads them from
+TEAMS_DIR = Path(__file__).parent / "data" / "custom_teams"
+
+# Simple roster composition, in depth chart order
+POSITION_COUNTS = {
+    "QB": 2,
+    "HB": 4,
+    "FB": 1,
+    "TE": 3,
+    "WR": 5,
+    "C": 2,
+    "OG": 4,
+    "OT": 4,
+    "DT": 4,
+    "DE": 4,
+    "LB": 6,
+    "CB": 4,
+    "FS": 2,
+    "SS": 2,
+    "K": 1,
+    "P": 1,
+}
+
+# Roster fields and the defaults used when a roster entry leaves them out
+INFO_DEFAULTS = {
+    "first_name": "",
+    "last_name": "",
+    "height": 70,
+    "weight": 200,
+    "age": 25,
+    "years_pro": 0,
+    "position": "",
+    "overall": 50,
+    "jersey_number": 0,
+}
+
+# Every stat in team_generator.stat_groups, in the same order
+STAT_NAMES = [
+    "awareness",
+    "speed",
+    "acceleration",
+    "strength",
+    "agility",
+    "change_of_direction",
+    "carrying",
+    "throw_power",
+    "throw_accuracy",
+    "throw_under_pressure",
+    "throw_on_the_run",
+    "play_action",
+    "route_running",
+    "release",
+    "catching",
+    "catch_in_traffic",
+    "run_block",
+    "pass_block",
+    "pursuit",
+    "tackle",
+    "hit_power",
+    "zone_coverage",
+    "man_coverage",
+    "press",
+    "kick_power",
+    "kick_accuracy",
+]
+STAT_DEFAULT = 50
+
+
+def get_team_filename(team_name: str) -> str:
+    return team_name.replace(" ", "_").lower() + ".json"
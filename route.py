@@ -0,0 +1,64 @@
+from bisect import bisect_right
+
+import pygame
+
+
+class Route:
+    """Route points compiled into segment lengths and cumulative distances
+
+    Indexes and iterates like the plain list of points it wraps.
+    """
+
+    def __init__(self, points: list[pygame.Vector2]):
+        self.points = points
+        # lengths[i] is the length of the segment ending at points[i]
+        self.lengths = [0.0]
+        self.cumulative = [0.0]
+        for i in range(1, len(points)):
+            length = (points[i] - points[i - 1]).length()
+            self.lengths.append(length)
+            self.cumulative.append(self.cumulative[-1] + length)
+
+    def __len__(self):
+        return len(self.points)
+
+    def __getitem__(self, index):
+        return self.points[index]
+
+    def __iter__(self):
+        return iter(self.points)
+
+    def remaining_distance(self, pos: pygame.Vector2, index: int) -> float:
+        """Distance left to run from pos when heading for points[index]"""
+        if index >= len(self.points):
+            return 0.0
+        leg_length = (self.points[index] - pos).length()
+        return leg_length + self.cumulative[-1] - self.cumulative[index]
+
+    def position_along(
+        self, pos: pygame.Vector2, index: int, distance: float
+    ) -> pygame.Vector2:
+        """Point reached after running `distance` from pos towards points[index]
+
+        The route ends at its last point.
+        """
+        if index >= len(self.points):
+            return pos.copy()
+
+        leg = self.points[index] - pos
+        leg_length = leg.length()
+        if distance < leg_length:
+            return pos + leg * (distance / leg_length)
+
+        along = self.cumulative[index] + distance - leg_length
+        if along >= self.cumulative[-1]:
+            return self.points[-1].copy()
+
+        # cumulative[k - 1] <= along < cumulative[k]
+        k = bisect_right(self.cumulative, along, index + 1)
+        start = self.points[k - 1]
+        t = (along - self.cumulative[k - 1]) / self.lengths[k]
+        return start + (self.points[k] - start) * t
+
+
+EMPTY_ROUTE = Route([])
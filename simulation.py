@@ -0,0 +1,500 @@
+import math
+from typing import Callable, Iterable, Optional, Union
+
+import pygame
+
+from ball import Ball, Halo
+from catching import CatchWindow, predict_catch_window
+from collisions import COLLISION_SOLVERS
+from config import (
+    CATCH_MAX_HEIGHT,
+    CATCH_RADIUS,
+    COLLISION_DISTANCE,
+    COLLISION_SOLVER,
+    FIELD_CENTER,
+    FRAME_RATE,
+    PERFECT_CATCHING,
+    YARD_LENGTH,
+)
+from fast_forward import advance_player, collision_horizon, player_horizon
+from player import Player
+from player_state import BoundPlayer, PlayerState
+from profiler import FrameProfiler, NullProfiler
+from rng import make_rng
+from team import Team
+from utils import get_yard_x
+
+# Routes for each play, keyed by receiver slot
+# Most frames an event-driven simulation steps before looking for a skip
+# again, after finding nothing to skip
+MAX_SKIP_BACKOFF = 8
+
+PLAYS = [
+    {
+        "wr_1": [{"yards": 2, "angle": -10}, {"yards": 25, "angle": 0}],
+        "wr_2": [{"yards": 10, "angle": 10}, {"yards": 25, "angle": 35}],
+        "wr_3": [
+            {"yards": 3, "angle": 0},
+            {"yards": 8, "angle": 35},
+            {"yards": 25, "angle": 60},
+        ],
+        "hb": [{"yards": 6, "angle": 90}, {"yards": 12, "angle": 60}],
+        "te": [{"yards": 3, "angle": -10}, {"yards": 20, "angle": -75}],
+    },
+    {
+        "wr_1": [{"yards": 5, "angle": 0}, {"yards": 20, "angle": 20}],
+        "wr_2": [{"yards": 3, "angle": 0}, {"yards": 15, "angle": -30}],
+        "wr_3": [{"yards": 2, "angle": -5}, {"yards": 10, "angle": 0}],
+        "hb": [{"yards": 4, "angle": 45}, {"yards": 10, "angle": 90}],
+        "te": [{"yards": 5, "angle": -15}, {"yards": 15, "angle": -45}],
+    },
+    {
+        "wr_1": [{"yards": 2, "angle": -10}, {"yards": 25, "angle": 0}],
+        "wr_2": [{"yards": 2, "angle": 10}, {"yards": 25, "angle": 0}],
+        "wr_3": [{"yards": 2, "angle": 0}, {"yards": 25, "angle": 0}],
+        "hb": [{"yards": 5, "angle": 90}],
+        "te": [{"yards": 3, "angle": -5}, {"yards": 25, "angle": -20}],
+    },
+]
+
+
+class SimulationEvent:
+    def __init__(self, frame: int, name: str, data: dict):
+        self.frame = frame
+        self.name = name
+        self.data = data
+
+    def __repr__(self):
+        return f"SimulationEvent(frame={self.frame}, name={self.name!r}, data={self.data!r})"
+
+
+class Simulation:
+    """Headless play state, advanced one frame at a time by update()"""
+
+    def __init__(
+        self,
+        offense_team: Team,
+        ball_on_yard: float = 20,
+        yards_to_go: float = 10,
+        play_selected: int = 0,
+        verbose: bool = True,
+        vectorized_movement: bool = False,
+        collision_solver: str = COLLISION_SOLVER,
+        seed: Optional[int] = None,
+        event_driven: bool = False,
+        profiler: Optional[FrameProfiler] = None,
+    ):
+        # Player surfaces render jersey numbers, which needs the font module
+        # even when there is no display
+        if not pygame.font.get_init():
+            pygame.font.init()
+
+        self.offense_team = offense_team
+        self.ball_on_yard = ball_on_yard
+        self.yards_to_go = yards_to_go
+        self.play_selected = play_selected
+        self.verbose = verbose
+        # Skip uneventful frames in step() and run_until()
+        self.event_driven = event_driven
+        self.handle_player_collisions = COLLISION_SOLVERS[collision_solver]
+        # Times each stage of update() when given a FrameProfiler
+        self.profiler = profiler or NullProfiler()
+
+        # Every source of randomness in the play draws from this stream
+        self.seed = seed
+        self.rng = make_rng(seed)
+
+        self.frame = 0
+        self.events: list[SimulationEvent] = []
+        self.ball_carrier: Optional[Player] = None
+        # Predicted catch frames for each receiver while a pass is in the air
+        self.catch_windows: dict[Player, CatchWindow] = {}
+        # Frame before which no players can collide, and the player motion
+        # it was worked out for
+        self.collision_deadline = 0
+        self.collision_key = None
+        # Frame from which to look for a skip again, and the wait after the
+        # next look that finds nothing
+        self.next_skip_check = 0
+        self.skip_backoff = 1
+        # Direction requested for the ball carrier, applied every frame
+        self.carrier_input = (0, 0)
+
+        # Create offensive players, ready to be bound to arrays if asked for
+        player_class = BoundPlayer if vectorized_movement else Player
+        self.lt = player_class.from_roster(offense_team, "OT", index=0)
+        self.lg = player_class.from_roster(offense_team, "OG", index=0)
+        self.c = player_class.from_roster(offense_team, "C", index=0)
+        self.rg = player_class.from_roster(offense_team, "OG", index=1)
+        self.rt = player_class.from_roster(offense_team, "OT", index=1)
+        self.qb = player_class.from_roster(offense_team, "QB", index=0)
+        self.hb = player_class.from_roster(offense_team, "HB", index=0)
+        self.te = player_class.from_roster(offense_team, "TE", index=0)
+        self.wr_1 = player_class.from_roster(offense_team, "WR", index=0)
+        self.wr_2 = player_class.from_roster(offense_team, "WR", index=1)
+        self.wr_3 = player_class.from_roster(offense_team, "WR", index=2)
+
+        # Create ball and halo
+        self.ball = Ball(verbose=verbose, rng=self.rng)
+        self.halo = Halo()
+
+        self.oline = pygame.sprite.Group(self.lt, self.lg, self.c, self.rg, self.rt)
+        self.receivers = pygame.sprite.Group(
+            self.wr_1, self.wr_2, self.wr_3, self.te, self.hb
+        )
+        self.offense = pygame.sprite.Group(self.oline, self.qb, self.receivers)
+        self.all_players = pygame.sprite.Group(self.offense)
+
+        # Optionally back player movement with contiguous arrays
+        self.player_state: Optional[PlayerState] = None
+        if vectorized_movement:
+            self.player_state = PlayerState(list(self.all_players))
+
+        self.reset_play()
+
+    def reseed(self, seed: Optional[int]):
+        """Restart the random stream, e.g. to reuse a simulation for a new trial"""
+        self.seed = seed
+        self.rng.seed(seed)
+
+    def log(self, message: str):
+        if self.verbose:
+            print(message)
+
+    def emit(self, name: str, **data) -> SimulationEvent:
+        event = SimulationEvent(self.frame, name, data)
+        self.events.append(event)
+        return event
+
+    def formation(self) -> dict[str, pygame.Vector2]:
+        ball_on_yard = self.ball_on_yard
+
+        # Offensive formation (shotgun)
+        return {
+            "lt": pygame.Vector2(get_yard_x(ball_on_yard - 0.5), FIELD_CENTER.y - 30),
+            "lg": pygame.Vector2(get_yard_x(ball_on_yard), FIELD_CENTER.y - 15),
+            "c": pygame.Vector2(get_yard_x(ball_on_yard), FIELD_CENTER.y),
+            "rg": pygame.Vector2(get_yard_x(ball_on_yard), FIELD_CENTER.y + 15),
+            "rt": pygame.Vector2(get_yard_x(ball_on_yard - 0.5), FIELD_CENTER.y + 30),
+            "qb": pygame.Vector2(get_yard_x(ball_on_yard - 5), FIELD_CENTER.y),
+            "hb": pygame.Vector2(get_yard_x(ball_on_yard - 5), FIELD_CENTER.y + 20),
+            "te": pygame.Vector2(get_yard_x(ball_on_yard - 1), FIELD_CENTER.y + 45),
+            "wr_1": pygame.Vector2(get_yard_x(ball_on_yard - 1), FIELD_CENTER.y - 160),
+            "wr_2": pygame.Vector2(get_yard_x(ball_on_yard - 2), FIELD_CENTER.y - 120),
+            "wr_3": pygame.Vector2(get_yard_x(ball_on_yard - 2), FIELD_CENTER.y - 80),
+        }
+
+    ###########
+    # ACTIONS #
+    ###########
+
+    def select_play(self, play: int):
+        self.play_selected = play
+        self.reset_play()
+
+    def reset_play(self):
+        self.ball_carrier = self.c
+
+        # reset offense
+        formation = self.formation()
+        for slot, pos in formation.items():
+            getattr(self, slot).reset_to(pos)
+
+        # reset ball position
+        self.ball.reset_to(formation["c"].copy())
+        self.catch_windows = {}
+        self.halo.set_pos(self.ball.pos.copy())
+
+        # set play routes
+        for slot, route in PLAYS[self.play_selected].items():
+            getattr(self, slot).set_route(route)
+
+        self.emit("reset", play=self.play_selected)
+
+    def snap(self):
+        if self.ball_carrier != self.c:
+            return
+        self.ball_carrier = self.qb
+        for receiver in self.receivers:
+            receiver.start_route()
+        self.log(f"Ball snapped to {self.qb}")
+        self.emit("snap", player=self.qb)
+
+    def throw(self, target_pos: pygame.Vector2, lob=False):
+        if self.ball_carrier is None:
+            return
+        passer = self.ball_carrier
+        self.ball.throw_to(target_pos.copy(), passer, lob)
+        passer.stop()
+        self.ball_carrier = None
+        self.emit(
+            "throw",
+            player=passer,
+            lob=lob,
+            landing_at=self.ball.landing_at.copy(),
+            frames=self.ball.frames_left,
+        )
+        self.handle_receiver_reaction()
+        self.predict_catch_windows()
+
+    def handle_receiver_reaction(self):
+        # Make nearest receiver run towards the ball
+        flight_frames = self.ball.frames_left
+        landing_at = self.ball.landing_at
+
+        def future_distance(receiver):
+            future_pos = receiver.estimate_position(flight_frames)
+            return (future_pos - landing_at).length()
+
+        nearest_receiver = min(self.receivers, key=future_distance)
+        awareness = nearest_receiver.record.awareness
+        min_frames = int(FRAME_RATE * 0.25)
+        max_frames = int(FRAME_RATE * 0.5)
+        reaction_frames = int(
+            max_frames - (awareness / 100) * (max_frames - min_frames)
+        )
+        nearest_receiver.reaction_timer = reaction_frames
+        nearest_receiver.reaction_target = landing_at.copy()
+        self.log(f"Reacted to throw [reaction_frames={reaction_frames}]")
+
+    ##########
+    # UPDATE #
+    ##########
+
+    def predict_catch_windows(self):
+        self.catch_windows = {
+            receiver: predict_catch_window(receiver, self.ball)
+            for receiver in self.receivers
+        }
+
+    def catch_candidates(self) -> list[CatchWindow]:
+        """Receivers predicted to get a chance at the ball, earliest first"""
+        windows = [window for window in self.catch_windows.values() if window.intervals]
+        return sorted(windows, key=lambda window: window.first_frame)
+
+    def move_ball_carrier(self):
+        if self.ball_carrier is None:
+            return
+
+        dx, dy = self.carrier_input
+        if dx != 0 or dy != 0:
+            self.ball_carrier.direction = pygame.Vector2(dx, dy).normalize()
+        else:
+            self.ball_carrier.stop()
+
+    def update_ball(self):
+        if self.ball_carrier:
+            self.ball.set_pos(self.ball_carrier.pos.copy())
+            return
+
+        in_flight = self.ball.frames_left > 0 or self.ball.z > 0
+        self.ball.update()
+        if self.ball.z == 0:
+            for receiver in self.receivers:
+                receiver.reset_reaction()
+            self.catch_windows = {}
+            if in_flight:
+                self.log("Pass incomplete")
+                self.emit("incomplete", landing_at=self.ball.pos.copy())
+            return
+
+        if not (self.ball.z > 0 and self.ball.z < CATCH_MAX_HEIGHT):
+            return
+
+        frame = self.ball.flight_frame
+        for receiver in self.receivers:
+            window = self.catch_windows.get(receiver)
+            if window is None or window.is_stale():
+                # Route or velocity changed since the prediction was made
+                window = predict_catch_window(receiver, self.ball)
+                self.catch_windows[receiver] = window
+            if not window.contains(frame):
+                continue
+
+            catch_rect = pygame.Rect(
+                receiver.pos.x - CATCH_RADIUS,
+                receiver.pos.y - CATCH_RADIUS,
+                CATCH_RADIUS * 2,
+                CATCH_RADIUS * 2,
+            )
+            if self.ball.rect.colliderect(catch_rect):
+                self.attempt_catch(receiver)
+                break
+
+    def attempt_catch(self, receiver: Player):
+        catching = receiver.record.catching
+        # Even a perfectly rated receiver can drop a pass occasionally
+        random_roll = self.rng.randint(1, 100)
+        self.log(
+            f"Attempting catch [z_yards={self.ball.z/YARD_LENGTH:.2f} catching={catching} random_roll={random_roll}]"
+        )
+        self.emit("catch_attempt", player=receiver, z=self.ball.z, roll=random_roll)
+        self.ball.stop()
+        self.catch_windows = {}
+        receiver.reset_reaction()
+        if random_roll <= catching or PERFECT_CATCHING:
+            self.log(f"Pass completed to {receiver}!")
+            self.ball_carrier = receiver
+            receiver.reset_route()
+            self.emit("catch", player=receiver, pos=receiver.pos.copy())
+        else:
+            self.log(f"Pass dropped by {receiver}!")
+            self.emit("drop", player=receiver, pos=receiver.pos.copy())
+
+    def update(self):
+        profiler = self.profiler
+        self.frame += 1
+        with profiler.section("move_ball_carrier"):
+            self.move_ball_carrier()
+        with profiler.section("players"):
+            if self.player_state is None:
+                self.all_players.update()
+            else:
+                self.player_state.update_routes()
+                self.player_state.move()
+        with profiler.section("collisions"):
+            self.handle_player_collisions(
+                self.all_players, COLLISION_DISTANCE, self.rng
+            )
+        with profiler.section("ball"):
+            self.update_ball()
+
+            # Make halo follow ball
+            self.halo.set_pos(self.ball.pos.copy())
+
+    def sync_sprites(self):
+        if self.player_state is not None:
+            self.player_state.sync_rects()
+
+    def frames_until_event(self) -> float:
+        """Frames that can be skipped before anything discrete can happen
+
+        Covers route points, reaction timers, the ball landing, predicted
+        catch windows and players coming into collision range.
+        """
+        # A single frame is stepped normally, so anything under two frames
+        # away ends the search early
+        horizon = math.inf
+        for player in self.all_players:
+            horizon = min(horizon, player_horizon(player))
+            if horizon < 2:
+                return 0
+
+        in_flight = self.ball.frames_left > 0 or self.ball.z > 0
+        if self.ball_carrier is None and in_flight:
+            # Step the last flight frame and the landing normally
+            horizon = min(horizon, self.ball.frames_left - 1)
+            frame = self.ball.flight_frame
+            for receiver in self.receivers:
+                window = self.catch_windows.get(receiver)
+                if window is None or window.is_stale():
+                    window = predict_catch_window(receiver, self.ball)
+                    self.catch_windows[receiver] = window
+                for first, last in window.intervals:
+                    if last > frame:
+                        horizon = min(horizon, max(first, frame + 1) - frame - 1)
+                        break
+            if horizon < 2:
+                return 0
+
+        # Checked last since it's the most expensive
+        horizon = min(horizon, self.get_collision_horizon(horizon))
+        return max(horizon, 0)
+
+    def get_collision_horizon(self, wanted: float) -> float:
+        """Frames that can be skipped before players could collide
+
+        The bound holds while every player keeps its heading, so it's kept
+        as a deadline until something turns a player: a collision impulse,
+        a new route or route point, a reaction timer running out, a reset or
+        the carrier being steered. A deadline that falls short is worked out
+        again from the current state.
+        """
+        players = list(self.all_players)
+        key = (
+            tuple(
+                (
+                    player.motion_version,
+                    player.route_index,
+                    player.running_route,
+                    player.reaction_timer > 0,
+                )
+                for player in players
+            ),
+            self.ball_carrier,
+            self.carrier_input,
+        )
+        horizon = self.collision_deadline - self.frame
+        if key != self.collision_key or horizon < wanted:
+            self.collision_key = key
+            horizon = collision_horizon(players, COLLISION_DISTANCE)
+            self.collision_deadline = self.frame + horizon
+        return horizon
+
+    def skip_frames(self, n_frames: int):
+        """Advance n uneventful frames in closed form"""
+        self.frame += n_frames
+        for player in self.all_players:
+            advance_player(player, n_frames)
+
+        if self.ball_carrier:
+            self.ball.set_pos(self.ball_carrier.pos.copy())
+        else:
+            self.ball.fast_forward(n_frames)
+        self.halo.set_pos(self.ball.pos.copy())
+
+    def advance(self, max_frames: int = 1) -> int:
+        """Advance at most max_frames, returning how many frames passed
+
+        Steps a single frame unless the simulation is event driven and the
+        next event is far enough away to skip ahead.
+        """
+        if self.event_driven and max_frames > 1 and self.frame >= self.next_skip_check:
+            self.move_ball_carrier()
+            n_frames = min(self.frames_until_event(), max_frames)
+            if n_frames >= 1:
+                self.skip_frames(int(n_frames))
+                self.skip_backoff = 1
+                return int(n_frames)
+            # Stepping is always exact, so back off from looking every frame
+            # while nothing can be skipped
+            self.next_skip_check = self.frame + self.skip_backoff
+            self.skip_backoff = min(self.skip_backoff * 2, MAX_SKIP_BACKOFF)
+
+        self.update()
+        return 1
+
+    def step(self, n_frames: int = 1) -> list[SimulationEvent]:
+        """Advance n frames and return the events emitted along the way"""
+        first_event = len(self.events)
+        remaining = n_frames
+        while remaining > 0:
+            remaining -= self.advance(remaining)
+        return self.events[first_event:]
+
+    def run_until(
+        self,
+        event: Union[str, Iterable[str], Callable[[SimulationEvent], bool]],
+        max_frames: int = FRAME_RATE * 60,
+    ) -> Optional[SimulationEvent]:
+        """Step until a matching event is emitted
+
+        `event` is an event name, a collection of names or a predicate on
+        SimulationEvent. Returns the matching event, or None if max_frames
+        ran out first.
+        """
+        if callable(event):
+            matches = event
+        else:
+            names = {event} if isinstance(event, str) else set(event)
+            matches = lambda emitted: emitted.name in names
+
+        remaining = max_frames
+        while remaining > 0:
+            first_event = len(self.events)
+            remaining -= self.advance(remaining)
+            for emitted in self.events[first_event:]:
+                if matches(emitted):
+                    return emitted
+
+        return None
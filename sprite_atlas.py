@@ -0,0 +1,92 @@
+from typing import Callable, Hashable
+
+import pygame
+
+from config import PLAYER_RADIUS
+from fonts import get_font
+
+
+class SpriteAtlas:
+    """Same-sized sprites packed into shared pages, each one drawn only once
+
+    Sprites are handed out as subsurfaces of the pages, so every user of a
+    key shares the same pixels. Pages are converted to the display format
+    when there is a display to convert to.
+    """
+
+    def __init__(self, size: int, columns: int = 16, rows: int = 16):
+        self.size = size
+        self.columns = columns
+        self.rows = rows
+        self.pages: list[pygame.Surface] = []
+        self.sprites: dict[Hashable, pygame.Surface] = {}
+        # Cells used on the last page
+        self.used = columns * rows
+
+    def __len__(self):
+        return len(self.sprites)
+
+    def add_page(self):
+        page = pygame.Surface(
+            (self.columns * self.size, self.rows * self.size), pygame.SRCALPHA
+        )
+        if pygame.display.get_surface() is not None:
+            page = page.convert_alpha()
+        page.fill((0, 0, 0, 0))
+        self.pages.append(page)
+        self.used = 0
+
+    def get(
+        self, key: Hashable, draw: Callable[[pygame.Surface], None]
+    ) -> pygame.Surface:
+        """Sprite for key, drawing it with draw(surface) the first time"""
+        sprite = self.sprites.get(key)
+        if sprite is not None:
+            return sprite
+
+        if self.used == self.columns * self.rows:
+            self.add_page()
+        row, column = divmod(self.used, self.columns)
+        self.used += 1
+
+        rect = pygame.Rect(column * self.size, row * self.size, self.size, self.size)
+        sprite = self.pages[-1].subsurface(rect)
+        draw(sprite)
+        self.sprites[key] = sprite
+        return sprite
+
+    def clear(self):
+        self.pages = []
+        self.sprites = {}
+        self.used = self.columns * self.rows
+
+
+PLAYER_TOKENS = SpriteAtlas(PLAYER_RADIUS * 2)
+
+
+def get_player_token(primary_color, secondary_color, number: int) -> pygame.Surface:
+    """Player circle in team colors with the jersey number on it"""
+
+    def draw(surface: pygame.Surface):
+        # Draw player circle
+        pygame.draw.circle(
+            surface,
+            secondary_color,
+            (PLAYER_RADIUS, PLAYER_RADIUS),
+            PLAYER_RADIUS,
+        )
+        pygame.draw.circle(
+            surface,
+            primary_color,
+            (PLAYER_RADIUS, PLAYER_RADIUS),
+            PLAYER_RADIUS - 1,
+        )
+        # Draw jersey number
+        text = get_font(None, PLAYER_RADIUS * 2).render(
+            str(number), True, secondary_color
+        )
+        text_rect = text.get_rect(center=(PLAYER_RADIUS, PLAYER_RADIUS))
+        surface.blit(text, text_rect)
+
+    key = (str(primary_color), str(secondary_color), number)
+    return PLAYER_TOKENS.get(key, draw)
@@ -1,5 +1,14 @@
 import json
+import sqlite3
 from pathlib import Path
+from typing import Optional
+
+from player_record import PlayerRecord
+from roster_format import TEAMS_DIR, get_team_filename
+
+ROSTER_CACHE_PATH = Path(__file__).parent / ".cache" / "rosters.sqlite3"
+# Stored in the cache's user_version, bumped whenever its tables change
+ROSTER_CACHE_VERSION = 1
 
 
 class Team:
@@ -9,19 +18,73 @@ class Team:
         self.secondary_color = data.get("secondary", "#000000")
         self.players = data.get("players", [])
 
-    def get_players_by_position(self, position: str):
+        # Players at each position, best overall first
+        self.depth_chart: dict[str, list[dict]] = {}
+        for player in self.players:
+            self.depth_chart.setdefault(player.get("position"), []).append(player)
+        for players in self.depth_chart.values():
+            players.sort(key=lambda x: x.get("overall", 0), reverse=True)
+
+        # Roster entries compiled for the simulation the first time they're
+        # asked for, keyed by id() of the entry
+        self.records: dict[int, PlayerRecord] = {}
+
+    def __getstate__(self):
+        # Entry ids don't survive pickling or copying, the records are
+        # compiled again on the other side
+        state = self.__dict__.copy()
+        state["records"] = {}
+        return state
+
+    def reindex(self, position: str):
+        """Rebuild the depth chart for a position after a roster edit"""
         players = [
             player for player in self.players if player.get("position") == position
         ]
+        if not players:
+            self.depth_chart.pop(position, None)
+            return
 
         # sort by overall_rating descending
         players.sort(key=lambda x: x.get("overall", 0), reverse=True)
+        self.depth_chart[position] = players
+
+    def get_players_by_position(self, position: str):
+        return list(self.depth_chart.get(position, []))
+
+    def get_player(self, position: str, depth: int = 0) -> dict:
+        """Player at a depth chart spot, 0 being the starter"""
+        return self.depth_chart[position][depth]
+
+    def get_record(self, position: str, depth: int = 0) -> PlayerRecord:
+        player = self.get_player(position, depth)
+        record = self.records.get(id(player))
+        if record is None:
+            record = PlayerRecord.from_roster(player)
+            self.records[id(player)] = record
+        return record
 
-        return players
+    def add_player(self, player: dict):
+        self.players.append(player)
+        self.reindex(player.get("position"))
+
+    def remove_player(self, player: dict):
+        self.players.remove(player)
+        self.records.pop(id(player), None)
+        self.reindex(player.get("position"))
+
+    def update_player(self, player: dict, **changes):
+        """Change a player's details, e.g. position or overall"""
+        position = player.get("position")
+        player.update(changes)
+        self.records.pop(id(player), None)
+        self.reindex(position)
+        if player.get("position") != position:
+            self.reindex(player.get("position"))
 
 
 def load_teams() -> list[Team]:
-    dir = Path(__file__).parent / "data" / "custom_teams"
+    dir = TEAMS_DIR
     teams = []
 
     for team_file in dir.glob("*.json"):
@@ -38,3 +101,155 @@ def load_teams() -> list[Team]:
         teams.append(team_ref)
 
     return teams
+
+
+def get_team(teams: list[Team], name: str) -> Team:
+    return [team for team in teams if team.name == name][0]
+
+
+class RosterStore:
+    """Teams indexed by name and parsed the first time they're asked for
+
+    The name index and the roster text are kept in an SQLite cache, so a
+    team file is only read again when its size or modification time changes.
+    Without a cache, a team is looked for under the file name
+    team_generator.py gives it, and the directory is only read through when
+    that misses or every name is needed.
+    """
+
+    def __init__(
+        self,
+        directory: Path = TEAMS_DIR,
+        cache_path: Optional[Path] = ROSTER_CACHE_PATH,
+    ):
+        self.directory = directory
+        # Team name to file, and teams loaded so far
+        self.files: dict[str, Path] = {}
+        self.teams: dict[str, Team] = {}
+        # Rosters parsed while indexing, until they're asked for
+        self.parsed: dict[str, dict] = {}
+        self.indexed = False
+
+        self.cache: Optional[sqlite3.Connection] = None
+        if cache_path is not None:
+            try:
+                cache_path.parent.mkdir(exist_ok=True)
+                self.cache = sqlite3.connect(cache_path)
+                (version,) = self.cache.execute("PRAGMA user_version").fetchone()
+                if version != ROSTER_CACHE_VERSION:
+                    self.migrate_cache()
+            except (OSError, sqlite3.Error):
+                # Read-only checkouts just go without the cache
+                self.cache = None
+
+        if self.cache is not None:
+            self.build_index()
+
+    def migrate_cache(self):
+        with self.cache:
+            # Older caches kept pickled rosters, which aren't safe to load
+            # from a file anyone could have written
+            self.cache.execute("DROP TABLE IF EXISTS teams")
+            self.cache.execute("DROP TABLE IF EXISTS rosters")
+            self.cache.execute(
+                "CREATE TABLE rosters ("
+                "file TEXT PRIMARY KEY, mtime INTEGER, size INTEGER, "
+                "name TEXT, data TEXT)"
+            )
+            self.cache.execute(f"PRAGMA user_version = {ROSTER_CACHE_VERSION}")
+
+    def build_index(self):
+        cached = {}
+        if self.cache is not None:
+            rows = self.cache.execute("SELECT file, mtime, size, name FROM rosters")
+            cached = {file: (mtime, size, name) for file, mtime, size, name in rows}
+
+        # Files already found by name
+        known = {team_file: name for name, team_file in self.files.items()}
+
+        changed = []
+        for team_file in sorted(self.directory.glob("*.json")):
+            stat = team_file.stat()
+            entry = cached.pop(team_file.name, None)
+            if entry is not None and entry[:2] == (stat.st_mtime_ns, stat.st_size):
+                name = entry[2]
+            elif self.cache is None and team_file in known:
+                name = known[team_file]
+            else:
+                with open(team_file, "r") as f:
+                    team_data = json.load(f)
+                name = team_data.get("name", "")
+                if self.cache is not None:
+                    # Stored compact, which halves the text to parse
+                    data = json.dumps(team_data, separators=(",", ":"))
+                    changed.append(
+                        (team_file.name, stat.st_mtime_ns, stat.st_size, name, data)
+                    )
+                self.parsed[name] = team_data
+            self.files[name] = team_file
+
+        if self.cache is not None and (changed or cached):
+            with self.cache:
+                self.cache.executemany(
+                    "INSERT OR REPLACE INTO rosters VALUES (?, ?, ?, ?, ?)", changed
+                )
+                # Files that have been removed since the cache was written
+                self.cache.executemany(
+                    "DELETE FROM rosters WHERE file = ?", [(file,) for file in cached]
+                )
+        self.indexed = True
+
+    def get_files(self) -> dict[str, Path]:
+        if not self.indexed:
+            self.build_index()
+        return self.files
+
+    def names(self) -> list[str]:
+        return list(self.get_files())
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.get_files()
+
+    def __len__(self):
+        return len(self.get_files())
+
+    def find(self, name: str) -> Optional[dict]:
+        """Roster from the file team_generator.py would have written for a team"""
+        team_file = self.directory / get_team_filename(name)
+        if not team_file.exists():
+            return None
+        with open(team_file, "r") as f:
+            team_data = json.load(f)
+        if team_data.get("name", "") != name:
+            return None
+        self.files[name] = team_file
+        return team_data
+
+    def get(self, name: str) -> Team:
+        team = self.teams.get(name)
+        if team is not None:
+            return team
+
+        team_data = self.parsed.pop(name, None)
+        if team_data is None and not self.indexed:
+            team_data = self.find(name)
+        if team_data is None:
+            if name not in self.get_files():
+                raise KeyError(f"No team named {name!r}")
+            team_data = self.parsed.pop(name, None)
+        if team_data is None and self.cache is not None:
+            row = self.cache.execute(
+                "SELECT data FROM rosters WHERE file = ?", (self.files[name].name,)
+            ).fetchone()
+            if row is not None:
+                team_data = json.loads(row[0])
+        if team_data is None:
+            with open(self.files[name], "r") as f:
+                team_data = json.load(f)
+
+        team = Team(team_data)
+        self.teams[name] = team
+        return team
+
+    def all(self) -> list[Team]:
+        return [self.get(name) for name in self.get_files()]
@@ -1,13 +1,39 @@
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+from collections import deque
+from functools import cache
 from pathlib import Path
+from typing import Iterator, Optional
 
+import numpy as np
 from faker import Faker
 
 from colors import get_color
+from rng import spawn_seeds
+from roster_format import POSITION_COUNTS, get_team_filename
 
 dir = Path(__file__).parent
 
 fake = Faker()
 
+# Names drawn from Faker up front for bulk generation to pick from
+NAME_POOL_SIZE = 2000
+
+# Teams generated together from one derived seed. Fixed, so a seed always
+# gives the same league no matter how many processes share the work.
+LEAGUE_BLOCK_SIZE = 64
+
+# How each generated team is written: a json file per team, indented or
+# compact, or one line per team in a single JSON lines file
+OUTPUT_FORMATS = {
+    "json": {"indent": 4},
+    "compact": {"separators": (",", ":")},
+    "jsonl": {"separators": (",", ":")},
+}
+
 
 stat_groups = {
     "awareness": ["awareness"],
@@ -675,67 +701,305 @@ def generate_player_data(position: str) -> dict:
     return player
 
 
+def generate_team(template: dict) -> dict:
+    """A full roster for one of TEAMS, one player at a time"""
+    players = []
+    used_numbers = set()
+    for position, count in POSITION_COUNTS.items():
+        # Gather all possible jersey numbers for this position
+        ranges = POSITIONS[position].get("jersey_number_ranges", [(0, 99)])
+        possible_numbers = set()
+        for r in ranges:
+            possible_numbers.update(range(r[0], r[1] + 1))
+        # Remove already used numbers
+        available_numbers = list(possible_numbers - used_numbers)
+        for _ in range(count):
+            if not available_numbers:
+                # If we run out, fallback to any unused number
+                jersey_number = next(
+                    num for num in range(0, 100) if num not in used_numbers
+                )
+            else:
+                jersey_number = fake.random_element(available_numbers)
+                available_numbers.remove(jersey_number)
+            used_numbers.add(jersey_number)
+            player_data = generate_player_data(position)
+            player_data["jersey_number"] = jersey_number
+            players.append(player_data)
+
+    # order players by overall within their position, but keeping the position order
+    position_order = list(POSITION_COUNTS.keys())
+    players.sort(key=lambda p: (position_order.index(p["position"]), -p["overall"]))
+
+    return {**template, "players": players}
+
+
+@cache
+def get_name_pool(size: int = NAME_POOL_SIZE) -> tuple[np.ndarray, np.ndarray]:
+    """First and last names sampled from Faker once, with a fixed seed"""
+    name_fake = Faker()
+    name_fake.seed_instance(0)
+    first_names = [name_fake.first_name_male() for _ in range(size)]
+    last_names = [name_fake.last_name() for _ in range(size)]
+    return np.array(first_names), np.array(last_names)
+
+
+def generate_stat_arrays(
+    position: str, shape: tuple[int, ...], rng: np.random.Generator
+) -> dict[str, np.ndarray]:
+    """generate_stat_ratings for a whole cohort, one array per stat"""
+    stats = {}
+
+    position_info = POSITIONS.get(position, {})
+    stat_ranges = position_info.get("stat_ranges", {})
+
+    for group, (min_val, max_val) in stat_ranges.items():
+        for stat in stat_groups.get(group, []):
+            stats[stat] = rng.integers(min_val, max_val, size=shape, endpoint=True)
+
+    return stats
+
+
+def calculate_overall_arrays(
+    position: str, stats: dict[str, np.ndarray], shape: tuple[int, ...]
+) -> np.ndarray:
+    """calculate_overall for a whole cohort"""
+    ignore_groups = POSITIONS.get(position, {}).get("overall_ignore_stat_groups", [])
+    ignore_stats = set()
+    for group in ignore_groups:
+        ignore_stats.update(stat_groups.get(group, []))
+    relevant_stats = [v for k, v in stats.items() if k not in ignore_stats]
+    if not relevant_stats:
+        return np.zeros(shape, dtype=np.int64)
+
+    return np.sum(relevant_stats, axis=0) // len(relevant_stats)
+
+
+def assign_jersey_numbers(
+    n_teams: int, rng: np.random.Generator
+) -> dict[str, np.ndarray]:
+    """Jersey numbers for every roster at once
+
+    Each position picks at random from its unused allowed numbers, falling
+    back to the lowest unused number when those run out.
+    """
+    used = np.zeros((n_teams, 100), dtype=bool)
+    # Sort keys past any random key, lowest number first
+    fallback = 1 + np.arange(100) / 100
+    numbers = {}
+    for position, count in POSITION_COUNTS.items():
+        allowed = np.zeros(100, dtype=bool)
+        for low, high in POSITIONS[position].get("jersey_number_ranges", [(0, 99)]):
+            allowed[low : high + 1] = True
+        keys = np.where(allowed, rng.random((n_teams, 100)), fallback)
+        keys[used] = np.inf
+        chosen = np.argsort(keys, axis=1)[:, :count]
+        np.put_along_axis(used, chosen, True, axis=1)
+        numbers[position] = chosen
+    return numbers
+
+
+def generate_cohort(
+    position: str, shape: tuple[int, int], rng: np.random.Generator
+) -> dict[str, np.ndarray]:
+    """Every player at a position across the league, as (teams, count) arrays"""
+    age = rng.integers(20, 40, size=shape, endpoint=True)
+    # Player goes pro between 20 and 25
+    years_pro = rng.integers(np.maximum(age - 25, 0), age - 20, endpoint=True)
+
+    stats = generate_stat_arrays(position, shape, rng)
+    overall = calculate_overall_arrays(position, stats, shape)
+
+    min_height, max_height = POSITIONS.get(position, {}).get("height", (70, 80))
+    min_weight, max_weight = POSITIONS.get(position, {}).get("weight", (160, 300))
+    first_names, last_names = get_name_pool()
+
+    return {
+        "first_name": rng.choice(first_names, size=shape),
+        "last_name": rng.choice(last_names, size=shape),
+        "height": rng.integers(min_height, max_height, size=shape, endpoint=True),
+        "weight": rng.integers(min_weight, max_weight, size=shape, endpoint=True),
+        "age": age,
+        "years_pro": years_pro,
+        "overall": overall,
+        "stats": stats,
+    }
+
+
+def generate_league(
+    n_teams: int, seed: Optional[int] = None, first_index: int = 0
+) -> list[dict]:
+    """Generate n_teams rosters, drawing each position cohort as arrays
+
+    Team names and colors cycle through TEAMS, numbered past the first
+    len(TEAMS) teams. first_index is the league position of the first team.
+    """
+    rng = np.random.default_rng(seed)
+    jersey_numbers = assign_jersey_numbers(n_teams, rng)
+
+    cohorts = []
+    for position, count in POSITION_COUNTS.items():
+        cohort = generate_cohort(position, (n_teams, count), rng)
+        cohort["jersey_number"] = jersey_numbers[position]
+        stats = cohort.pop("stats")
+        stat_names = list(stats)
+        # Stats as one (teams, count, stat) array, so they sort with the rest
+        cohort["stats"] = np.stack(list(stats.values()), axis=-1)
+
+        # Order players by overall within their position
+        order = np.argsort(-cohort["overall"], axis=1, kind="stable")
+        columns = {
+            field: np.take_along_axis(
+                values, order.reshape(order.shape + (1,) * (values.ndim - 2)), axis=1
+            ).tolist()
+            for field, values in cohort.items()
+        }
+        cohorts.append((position, stat_names, columns))
+
+    teams = []
+    for i in range(n_teams):
+        index = first_index + i
+        template = TEAMS[index % len(TEAMS)]
+        name = template["name"]
+        if index >= len(TEAMS):
+            name = f"{name} {index // len(TEAMS) + 1}"
+
+        players = []
+        for position, stat_names, columns in cohorts:
+            for j in range(POSITION_COUNTS[position]):
+                players.append(
+                    {
+                        "first_name": columns["first_name"][i][j],
+                        "last_name": columns["last_name"][i][j],
+                        "height": columns["height"][i][j],
+                        "weight": columns["weight"][i][j],
+                        "age": columns["age"][i][j],
+                        "years_pro": columns["years_pro"][i][j],
+                        "position": position,
+                        "overall": columns["overall"][i][j],
+                        "jersey_number": columns["jersey_number"][i][j],
+                        "stats": dict(zip(stat_names, columns["stats"][i][j])),
+                    }
+                )
+
+        teams.append({**template, "name": name, "players": players})
+
+    return teams
+
+
 def write_to_output_file(team_name: str, data: list[dict]):
-    team_name = team_name.replace(" ", "_").lower()
     output_dir = dir / "data" / "custom_teams"
     output_dir.mkdir(exist_ok=True)
 
-    output_file = output_dir / f"{team_name}.json"
+    output_file = output_dir / get_team_filename(team_name)
     with open(output_file, "w") as f:
-        import json
-
         json.dump(data, f, indent=4)
 
 
-if __name__ == "__main__":
-    for team in TEAMS:
-        players = []
-        # Simple roster composition
-        position_counts = {
-            "QB": 2,
-            "HB": 4,
-            "FB": 1,
-            "TE": 3,
-            "WR": 5,
-            "C": 2,
-            "OG": 4,
-            "OT": 4,
-            "DT": 4,
-            "DE": 4,
-            "LB": 6,
-            "CB": 4,
-            "FS": 2,
-            "SS": 2,
-            "K": 1,
-            "P": 1,
-        }
+def generate_block(
+    first_index: int, n_teams: int, seed: int, output_format: str
+) -> list[tuple[str, str]]:
+    """(name, serialized team) for one block of a league, run in the workers"""
+    teams = generate_league(n_teams, seed, first_index)
+    options = OUTPUT_FORMATS[output_format]
+    return [(team["name"], json.dumps(team, **options)) for team in teams]
+
+
+def stream_league(
+    n_teams: int,
+    seed: Optional[int] = None,
+    output_format: str = "json",
+    processes: Optional[int] = None,
+) -> Iterator[list[tuple[str, str]]]:
+    """Generate a league over a process pool, yielding blocks in league order
+
+    Only a couple of blocks per process are in flight at once, so memory
+    stays the same however large the league is.
+    """
+    n_blocks = -(-n_teams // LEAGUE_BLOCK_SIZE)
+    # Each block gets its own stream, so output doesn't depend on the pool size
+    seeds = spawn_seeds(seed, n_blocks)
+
+    processes = processes or os.cpu_count() or 1
+    with multiprocessing.Pool(processes) as pool:
+        pending = deque()
+        for block, block_seed in enumerate(seeds):
+            first_index = block * LEAGUE_BLOCK_SIZE
+            size = min(LEAGUE_BLOCK_SIZE, n_teams - first_index)
+            pending.append(
+                pool.apply_async(
+                    generate_block, (first_index, size, block_seed, output_format)
+                )
+            )
+            if len(pending) >= processes * 2:
+                yield pending.popleft().get()
+        while pending:
+            yield pending.popleft().get()
+
+
+def write_league(
+    output: Path,
+    n_teams: int,
+    seed: Optional[int] = None,
+    output_format: str = "json",
+    processes: Optional[int] = None,
+) -> int:
+    """Write a generated league to disk as blocks finish, returns teams written
+
+    json and compact write a file per team into the output directory, jsonl
+    writes every team to the output file, one per line.
+    """
+    blocks = stream_league(n_teams, seed, output_format, processes)
+    written = 0
+    if output_format == "jsonl":
+        output.parent.mkdir(parents=True, exist_ok=True)
+        with open(output, "w") as f:
+            for block in blocks:
+                f.writelines(text + "\n" for _, text in block)
+                written += len(block)
+    else:
+        output.mkdir(parents=True, exist_ok=True)
+        for block in blocks:
+            for name, text in block:
+                with open(output / get_team_filename(name), "w") as f:
+                    f.write(text)
+            written += len(block)
+    return written
 
-        used_numbers = set()
-        for position, count in position_counts.items():
-            # Gather all possible jersey numbers for this position
-            ranges = POSITIONS[position].get("jersey_number_ranges", [(0, 99)])
-            possible_numbers = set()
-            for r in ranges:
-                possible_numbers.update(range(r[0], r[1] + 1))
-            # Remove already used numbers
-            available_numbers = list(possible_numbers - used_numbers)
-            for _ in range(count):
-                if not available_numbers:
-                    # If we run out, fallback to any unused number
-                    jersey_number = next(
-                        num for num in range(0, 100) if num not in used_numbers
-                    )
-                else:
-                    jersey_number = fake.random_element(available_numbers)
-                    available_numbers.remove(jersey_number)
-                used_numbers.add(jersey_number)
-                player_data = generate_player_data(position)
-                player_data["jersey_number"] = jersey_number
-                players.append(player_data)
-
-        # order players by overall within their position, but keeping the position order
-        position_order = list(position_counts.keys())
-        players.sort(key=lambda p: (position_order.index(p["position"]), -p["overall"]))
-
-        team["players"] = players
-        write_to_output_file(team.get("name"), team)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a league of teams")
+    parser.add_argument("--teams", type=int, default=len(TEAMS))
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, default="json")
+    parser.add_argument(
+        "--per-player",
+        action="store_true",
+        help="write the built-in teams to data/custom_teams with the original "
+        "one player at a time generator",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help="directory for json/compact (default data/custom_teams), "
+        "file for jsonl (default data/league.jsonl)",
+    )
+    args = parser.parse_args()
+
+    if args.per_player:
+        for template in TEAMS:
+            write_to_output_file(template["name"], generate_team(template))
+        print(f"Wrote {len(TEAMS)} teams to {dir / 'data' / 'custom_teams'}")
+        sys.exit(0)
+
+    output = args.output
+    if output is None:
+        if args.format == "jsonl":
+            output = dir / "data" / "league.jsonl"
+        else:
+            output = dir / "data" / "custom_teams"
+
+    written = write_league(output, args.teams, args.seed, args.format, args.processes)
+    print(f"Wrote {written} teams to {output}")